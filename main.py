@@ -1,8 +1,7 @@
 from dotenv import load_dotenv
 import os
 
-from fastapi import FastAPI, Request
-from fastapi.middleware.cors import CORSMiddleware
+from fastapi import FastAPI
 
 # Deine Router
 from app.utils.classes import RatingResponse, Rating
@@ -13,8 +12,8 @@ from app.routers.flow_edit_tools import router as flow_edit_tools_router
 from app.routers.crawl import router as crawl_router
 
 # TUI Imports
-from fastapi_tui import with_tui, TUIConfig, create_tui_app
-from fastapi_tui.exception_handler_utils import handle_exception_with_tui
+from fastapi_tui import with_tui, TUIConfig, create_tui_app, CORSConfig
+from fastapi_tui.exception_handler_utils import make_exception_handler
 
 load_dotenv()
 
@@ -26,8 +25,8 @@ app = FastAPI()
 
 
 # --- 3. MIDDLEWARE ---
-app.add_middleware(
-    CORSMiddleware,
+# CORS wird von create_tui_app mitregistriert (eine Middleware statt zwei)
+cors = CORSConfig(
     allow_origins=["*"],
     allow_credentials=True,
     allow_methods=["*"],
@@ -35,13 +34,10 @@ app.add_middleware(
 )
 
 # --- 4. EXCEPTION HANDLER ---
-@app.exception_handler(Exception)
-async def global_exception_handler(request: Request, exc: Exception):
-    return handle_exception_with_tui(
-        request, 
-        exc,
-        error_message="Internal Server Error Critical"
-    )
+app.add_exception_handler(
+    Exception,
+    make_exception_handler(error_message="Internal Server Error Critical")
+)
 
 # --- 5. ROUTER ---
 app.include_router(tools_router, prefix=f"/api/{version}/tools", tags=["tools"])
@@ -52,7 +48,7 @@ app.include_router(agents5_router, prefix=f"/api/{version}/agents", tags=["agent
 
 # --- 2. TUI KONFIGURIEREN ---
 # Das muss hier stehen, damit die Middleware geladen wird
-app = create_tui_app(app)
+app = create_tui_app(app, cors=cors)
 
 # --- 6. ENTRY POINT ---
 if __name__ == "__main__":
@@ -39,60 +39,76 @@ with_tui(app, config=config)
 ```
 """
 
-# Config
-from .config import TUIConfig, LogLevel, get_config, set_config
-
-# Setup - Main entry point
-from .setup import with_tui
-
-# Configure TUI
-from .configure_tui import configure_tui, create_tui_app
-
-# Core Models
-from .core import (
-    EventType,
-    EndpointHit,
-    CustomEvent,
-    EndpointStats,
-    TUIEvent,
-    create_hit_id,
-    create_pending_hit,
-    create_completed_hit,
-    create_custom_event,
-)
-
-# Middleware
-from .middleware import TUIMiddleware
+import importlib
 
-# App
-from .app import FastAPITUI, TUIManager, get_tui_manager
+# Config (eager: günstig und wird praktisch immer gebraucht)
+from .config import TUIConfig, LogLevel, get_config, set_config
 
-# Runner
-from .runner import TUIRunner, run_tui
+# Alles andere wird erst beim ersten Zugriff importiert (PEP 562).
+# So zahlt `from fastapi_tui import with_tui` nicht den Import von
+# Textual, SQLite, Multiprocessing usw.
+_LAZY_EXPORTS = {
+    # Setup - Main entry point
+    "with_tui": ".setup",
+    # Configure TUI
+    "configure_tui": ".configure_tui",
+    "create_tui_app": ".configure_tui",
+    "install_tui": ".configure_tui",
+    # Core Models
+    "EventType": ".core",
+    "EndpointHit": ".core",
+    "CustomEvent": ".core",
+    "EndpointStats": ".core",
+    "TUIEvent": ".core",
+    "create_hit_id": ".core",
+    "create_pending_hit": ".core",
+    "create_completed_hit": ".core",
+    "create_custom_event": ".core",
+    # Middleware
+    "TUIMiddleware": ".middleware",
+    "TUIFusedMiddleware": ".middleware",
+    "CORSConfig": ".middleware",
+    # App
+    "FastAPITUI": ".app",
+    "TUIManager": ".app",
+    "get_tui_manager": ".app",
+    # Runner
+    "TUIRunner": ".runner",
+    "run_tui": ".runner",
+    # Persistence
+    "TUIPersistence": ".persistence",
+    # Widgets (for customization)
+    "AutoScrollLog": ".widgets",
+    "JSONViewer": ".widgets",
+    "RuntimeLogsViewer": ".widgets",
+    "EndpointList": ".widgets",
+    "RequestViewer": ".widgets",
+    "RequestInspector": ".widgets",
+    "StatsDashboard": ".widgets",
+    "ExceptionViewer": ".widgets",
+    # Loggers
+    "init_logger": ".loggers.server_logger",
+    "write_server_log": ".loggers.server_logger",
+    "add_runtime_log": ".loggers.runtime_logger",
+    "get_runtime_logs": ".loggers.runtime_logger",
+    "capture_exception": ".loggers.exception_logger",
+    "get_error_response_detail": ".loggers.exception_logger",
+}
 
-# Persistence
-from .persistence import TUIPersistence
 
-from .configure_tui import configure_tui
+def __getattr__(name: str):
+    module_path = _LAZY_EXPORTS.get(name)
+    if module_path is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_path, __name__), name)
+    # Cachen, damit __getattr__ für diesen Namen nicht erneut aufgerufen wird
+    globals()[name] = value
+    return value
 
-# Widgets (for customization)
-from .widgets import (
-    AutoScrollLog,
-    JSONViewer,
-    RuntimeLogsViewer,
-    EndpointList,
-    RequestViewer,
-    RequestInspector,
-    StatsDashboard,
-    ExceptionViewer,
-)
 
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
 
-# Loggers
-# Loggers
-from .loggers.server_logger import init_logger, write_server_log
-from .loggers.runtime_logger import add_runtime_log, get_runtime_logs
-from .loggers.exception_logger import capture_exception, get_error_response_detail
 
 __all__ = [
     # Config
@@ -105,6 +121,7 @@ __all__ = [
     # Configure TUI
     "configure_tui",
     "create_tui_app",
+    "install_tui",
     # Core Models
     "EventType",
     "EndpointHit",
@@ -117,6 +134,8 @@ __all__ = [
     "create_custom_event",
     # Middleware
     "TUIMiddleware",
+    "TUIFusedMiddleware",
+    "CORSConfig",
     # App
     "FastAPITUI",
     "TUIManager",
@@ -146,6 +165,5 @@ __all__ = [
     "add_runtime_log",
     "get_runtime_logs",
     "capture_exception",
-    "is_dev_mode",
     "get_error_response_detail",
 ]
@@ -23,7 +23,7 @@ def run_fastapi_process(queue: MPQueue, host: str = "0.0.0.0", port: int = 8000)
     
     This is used by TUIRunner when reload=False.
     """
-    from .loggers.server_logger import init_logger, write_server_log
+    from .loggers.server_logger import init_logger, write_server_log, BridgeLogger
     import sys
     
     try:
@@ -31,21 +31,9 @@ def run_fastapi_process(queue: MPQueue, host: str = "0.0.0.0", port: int = 8000)
         init_logger(queue)
         write_server_log("FastAPI process started", "SYSTEM")
         
-        # Redirect stdout/stderr to TUI
-        class BridgeLogger:
-            def write(self, msg):
-                try:
-                    if msg and msg.strip():
-                        write_server_log(msg.strip(), "PRINT")
-                except Exception:
-                    pass
-            def flush(self): 
-                pass
-            def isatty(self): 
-                return False
-        
-        sys.stdout = BridgeLogger()
-        sys.stderr = BridgeLogger()
+        # Redirect stdout/stderr to TUI (buffered, one queue put per batch)
+        sys.stdout = BridgeLogger("PRINT")
+        sys.stderr = BridgeLogger("PRINT")
         
         # Create app with queue
         from app.main import create_app
@@ -3,29 +3,92 @@ Cross-platform clipboard utilities with OSC52 support for SSH sessions.
 Works on Linux, macOS, and Windows.
 """
 
+import os
 import platform
 import base64
+import shutil
+import subprocess
 import sys
+from functools import partial
+from typing import Callable, Optional
+
+try:
+    import pyperclip
+except ImportError:
+    pyperclip = None
+
+
+# platform.system() ändert sich zur Laufzeit nicht
+_SYSTEM = platform.system()
+
+CopyFn = Callable[[str], tuple[bool, str]]
+
+# Gewähltes Backend (wird beim ersten Copy einmalig ermittelt)
+_copy_fn: Optional[CopyFn] = None
 
 
 def copy_to_clipboard(text: str) -> tuple[bool, str]:
     """
     Copy text to clipboard using the best available method.
     
+    The backend is detected once and cached; if it fails, the next
+    call re-runs detection.
+    
     Returns:
         tuple[bool, str]: (success, error_message)
     """
-    # Try OSC52 first (works over SSH and locally for compatible terminals)
-    if _try_osc52(text):
-        return True, ""
+    global _copy_fn
+    copy_fn = _copy_fn or _detect_copy_backend()
+    success, error = copy_fn(text)
+    if not success:
+        _copy_fn = None
+    return success, error
+
+
+def _detect_copy_backend() -> CopyFn:
+    """
+    Probe the available clipboard methods once and cache the winner.
     
-    # Fallback to platform-specific methods
-    system = platform.system()
+    Order: OSC52 (works over SSH) → pyperclip → xclip/xsel (Linux) → pbcopy (macOS).
+    """
+    global _copy_fn
     
-    if system == "Windows":
-        return _copy_windows(text)
-    else:  # Linux, macOS
-        return _copy_unix(text)
+    if _tty_available():
+        _copy_fn = _copy_osc52
+    elif pyperclip is not None:
+        _copy_fn = _copy_pyperclip
+    elif _SYSTEM == "Linux" and shutil.which("xclip"):
+        _copy_fn = partial(_copy_command, ["xclip", "-selection", "clipboard"])
+    elif _SYSTEM == "Linux" and shutil.which("xsel"):
+        _copy_fn = partial(_copy_command, ["xsel", "--clipboard", "--input"])
+    elif _SYSTEM == "Darwin" and shutil.which("pbcopy"):
+        _copy_fn = partial(_copy_command, ["pbcopy"])
+    else:
+        # Nicht cachen: vielleicht wird später etwas installiert
+        return _copy_unavailable
+    
+    return _copy_fn
+
+
+# Terminal-FD für OSC52: einmal öffnen, danach nur noch write(2)
+_UNSET = object()
+_tty_fd = _UNSET
+
+
+def _get_tty_fd() -> Optional[int]:
+    """Open the controlling terminal once and keep the fd (None if unavailable)."""
+    global _tty_fd
+    if _tty_fd is _UNSET:
+        try:
+            path = "CONOUT$" if _SYSTEM == "Windows" else "/dev/tty"
+            _tty_fd = os.open(path, os.O_WRONLY)
+        except OSError:
+            _tty_fd = None
+    return _tty_fd
+
+
+def _tty_available() -> bool:
+    return _get_tty_fd() is not None
 
 
 def _try_osc52(text: str) -> bool:
@@ -33,99 +96,43 @@ def _try_osc52(text: str) -> bool:
     Try to copy using OSC52 escape sequence.
     This works in most modern terminals, including over SSH.
     """
-    try:
-        encoded = base64.b64encode(text.encode()).decode()
-        osc52 = f"\033]52;c;{encoded}\007"
-        
-        # Try to write directly to terminal
-        if platform.system() == "Windows":
-            try:
-                with open('CON', 'w', encoding='utf-8') as tty:
-                    tty.write(osc52)
-                    tty.flush()
-                    return True
-            except:
-                pass
-        else:
-            try:
-                with open('/dev/tty', 'w') as tty:
-                    tty.write(osc52)
-                    tty.flush()
-                    return True
-            except:
-                pass
-        
+    fd = _get_tty_fd()
+    if fd is None:
         return False
-    except Exception:
+    try:
+        # Bytes direkt, ohne Umweg über str und ohne Text-Layer
+        os.write(fd, b"\x1b]52;c;" + base64.b64encode(text.encode()) + b"\x07")
+        return True
+    except OSError:
         return False
 
 
-def _copy_windows(text: str) -> tuple[bool, str]:
-    """Copy to clipboard on Windows."""
+def _copy_osc52(text: str) -> tuple[bool, str]:
+    if _try_osc52(text):
+        return True, ""
+    return False, "Could not write OSC52 sequence to terminal"
+
+
+def _copy_pyperclip(text: str) -> tuple[bool, str]:
     try:
-        import pyperclip
         pyperclip.copy(text)
         return True, ""
-    except ImportError:
-        return False, "pyperclip not installed. Install with: pip install pyperclip"
     except Exception as e:
         return False, f"Copy failed: {e}"
 
 
-def _copy_unix(text: str) -> tuple[bool, str]:
-    """Copy to clipboard on Linux/macOS."""
-    # Try pyperclip first
+def _copy_command(cmd: list, text: str) -> tuple[bool, str]:
+    """Copy via external tool (xclip, xsel, pbcopy)."""
     try:
-        import pyperclip
-        pyperclip.copy(text)
+        subprocess.run(cmd, input=text.encode(), check=True, timeout=1)
         return True, ""
-    except ImportError:
-        pass
-    except Exception:
-        pass
-    
-    # Fallback to xclip/xsel on Linux
-    if platform.system() == "Linux":
-        import subprocess
-        
-        # Try xclip
-        try:
-            subprocess.run(
-                ['xclip', '-selection', 'clipboard'],
-                input=text.encode(),
-                check=True,
-                timeout=1
-            )
-            return True, ""
-        except (FileNotFoundError, subprocess.SubprocessError):
-            pass
-        
-        # Try xsel
-        try:
-            subprocess.run(
-                ['xsel', '--clipboard', '--input'],
-                input=text.encode(),
-                check=True,
-                timeout=1
-            )
-            return True, ""
-        except (FileNotFoundError, subprocess.SubprocessError):
-            pass
-    
-    # Fallback to pbcopy on macOS
-    if platform.system() == "Darwin":
-        import subprocess
-        try:
-            subprocess.run(
-                ['pbcopy'],
-                input=text.encode(),
-                check=True,
-                timeout=1
-            )
-            return True, ""
-        except (FileNotFoundError, subprocess.SubprocessError):
-            pass
-    
+    except (FileNotFoundError, subprocess.SubprocessError) as e:
+        return False, f"Copy failed ({cmd[0]}): {e}"
+
+
+def _copy_unavailable(text: str) -> tuple[bool, str]:
+    if _SYSTEM == "Windows":
+        return False, "pyperclip not installed. Install with: pip install pyperclip"
     return False, "No clipboard method available. Install pyperclip or xclip/xsel"
 
 
@@ -1,10 +1,16 @@
 import os
+import re
 import sys
 import json
-from dataclasses import dataclass, field, asdict
-from typing import Optional, List, Set, Dict, Any
+import argparse
+import functools
+import warnings
+from dataclasses import dataclass, field, fields
+from typing import Callable, Optional, List, Set, Dict, Any
 from enum import Enum
 
+from .json_utils import json_dumps, json_loads
+
 class LogLevel(str, Enum):
     DEBUG = "debug"
     INFO = "info"
@@ -12,6 +18,87 @@ class LogLevel(str, Enum):
     ERROR = "error"
     CRITICAL = "critical"
 
+def _json_default(obj: Any) -> Any:
+    """JSON-Fallback für Typen, die weder json noch orjson kennen."""
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, Enum):
+        return obj.value
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class _PathTrie:
+    """
+    Segment-Trie für exclude_paths.
+    
+    "/health"    → exakter Match
+    "/static/*"  → alles unterhalb von /static/
+    
+    Lookup-Kosten hängen nur von der Tiefe des Pfads ab, nicht von der Anzahl der Einträge.
+    """
+    WILDCARD = "*"
+
+    def __init__(self):
+        self.children: Dict[str, "_PathTrie"] = {}
+        self.terminal = False
+        self.wildcard = False
+
+    @classmethod
+    def from_iterable(cls, paths) -> "_PathTrie":
+        trie = cls()
+        for path in paths:
+            trie.insert(path)
+        return trie
+
+    def insert(self, path: str) -> None:
+        segments = path.split("/")
+        is_wildcard = len(segments) > 1 and segments[-1] == self.WILDCARD
+        if is_wildcard:
+            segments = segments[:-1]
+        
+        node = self
+        for segment in segments:
+            node = node.children.setdefault(segment, _PathTrie())
+        if is_wildcard:
+            node.wildcard = True
+        else:
+            node.terminal = True
+
+    def matches(self, path: str) -> bool:
+        node = self
+        for segment in path.split("/"):
+            if node.wildcard:
+                return True
+            node = node.children.get(segment)
+            if node is None:
+                return False
+        return node.terminal
+
+
+# Bis zu dieser Größe ist eine kompilierte Regex schneller als der Trie
+# (C-Schleife vs. Python-Schleife), darüber gewinnt der Trie.
+_EXCLUDE_REGEX_MAX_PATHS = 32
+
+def _compile_exclude_matcher(paths) -> Callable[[str], bool]:
+    """
+    Baut die Match-Funktion für exclude_paths (exakt oder "/prefix/*").
+    Kleine Listen → eine einzige Regex, große Listen → _PathTrie.
+    """
+    if len(paths) > _EXCLUDE_REGEX_MAX_PATHS:
+        return _PathTrie.from_iterable(paths).matches
+    if not paths:
+        return lambda path: False
+    
+    alternatives = []
+    for path in sorted(paths):
+        if path.endswith("/*"):
+            alternatives.append(re.escape(path[:-1]) + ".*")
+        else:
+            alternatives.append(re.escape(path))
+    fullmatch = re.compile("(?s:" + "|".join(alternatives) + ")").fullmatch
+    return lambda path: fullmatch(path) is not None
+
+
 @dataclass
 class TUIConfig:
     """
@@ -49,6 +136,7 @@ class TUIConfig:
     # Request filtering
     # Standardmäßig filtern wir nur technische Health-Checks.
     # Alles andere wird geloggt.
+    # Exakte Pfade ("/health") oder Prefixe mit Wildcard ("/static/*")
     exclude_paths: Set[str] = field(default_factory=lambda: {})
     
     exclude_methods: Set[str] = field(default_factory=set)
@@ -81,6 +169,46 @@ class TUIConfig:
     # Persistence settings
     db_path: str = "tui_events.db"
 
+    def __post_init__(self):
+        # Filter-/Masking-Sets hat __setattr__ schon eingefroren/lowercased,
+        # dadurch können die Entscheidungen darauf gecacht werden.
+        self._build_caches()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        # Filter-/Masking-Sets immer als frozenset ablegen (Masking-Keys lowercase),
+        # egal ob aus __init__ oder per späterer Zuweisung
+        normalize = _FILTER_FIELDS.get(name)
+        if normalize is not None:
+            value = normalize(value)
+        object.__setattr__(self, name, value)
+        # Jede Feld-Zuweisung verwirft den gecachten JSON-Payload.
+        # (In-place Mutationen von Listen/Dicts werden NICHT erkannt.)
+        if not name.startswith("_"):
+            object.__setattr__(self, "_payload_cache", None)
+            # Gecachte Entscheidungen neu aufbauen (erst nach __post_init__,
+            # vorher existieren die Caches noch nicht)
+            if "_format_endpoint_cached" in self.__dict__:
+                if normalize is not None:
+                    self._build_caches()
+                elif name in _DISPLAY_FIELDS:
+                    self._build_display_caches()
+
+    def _build_caches(self) -> None:
+        """(Re-)Initialisiert die gecachten Entscheidungs-Funktionen dieser Instanz."""
+        self._exclude_matcher = _compile_exclude_matcher(self.exclude_paths)
+        self._should_log_cached = functools.lru_cache(maxsize=4096)(self._should_log_uncached)
+        self._mask_header_cached = functools.lru_cache(maxsize=1024)(self._mask_header_uncached)
+        self._mask_field_cached = functools.lru_cache(maxsize=4096)(self._mask_field_uncached)
+        self._build_display_caches()
+
+    def _build_display_caches(self) -> None:
+        """Vorberechnete Strukturen für format_endpoint_for_display."""
+        # Längste Prefixe zuerst, um /api/v1 vor /api zu matchen
+        self._sorted_strip_prefixes = tuple(sorted(self.strip_prefixes, key=len, reverse=True))
+        self._replacements_pattern = _compile_replacements(self.endpoint_replacements)
+        # Wenige Routen → fast jeder Aufruf ist ein Cache-Hit
+        self._format_endpoint_cached = functools.lru_cache(maxsize=1024)(self._format_endpoint_uncached)
+
     # --- LOGIC METHODS ---
 
     def should_log_request(self, path: str, method: str) -> bool:
@@ -88,12 +216,14 @@ class TUIConfig:
         Entscheidet, ob ein Request geloggt werden soll.
         Standardmäßig JA, außer er ist explizit ausgeschlossen.
         """
-        # 1. Globaler Schalter
+        # 1. Globaler Schalter (nicht gecacht, kann zur Laufzeit umgeschaltet werden)
         if not self.enable_request_logging:
             return False
-            
-        # 2. Pfad-Ausschluss (exakter Match)
-        if path in self.exclude_paths:
+        return self._should_log_cached(path, method)
+
+    def _should_log_uncached(self, path: str, method: str) -> bool:
+        # 2. Pfad-Ausschluss (exakter Match oder "/prefix/*")
+        if self.is_path_excluded(path):
             return False
             
         # 3. Methoden-Ausschluss
@@ -102,6 +232,30 @@ class TUIConfig:
             
         return True
 
+    def is_path_excluded(self, path: str) -> bool:
+        """Prüft einen Pfad gegen exclude_paths (exakt oder per "/prefix/*" Wildcard)."""
+        return self._exclude_matcher(path)
+
+    def should_mask_header(self, key: str) -> bool:
+        """Ob ein Header-Wert maskiert werden muss (case-insensitive, gecacht)."""
+        # Fast Path: Header-Keys kommen von Starlette/httptools bereits lowercase
+        if key in self.mask_headers:
+            return True
+        return self._mask_header_cached(key)
+
+    def _mask_header_uncached(self, key: str) -> bool:
+        return key.lower() in self.mask_headers
+
+    def should_mask_field(self, key: str) -> bool:
+        """Ob ein Body-/Variablen-Feld maskiert werden muss (case-insensitive, gecacht)."""
+        # Fast Path: direkter Treffer ohne key.lower() / Cache-Lookup
+        if key in self.mask_body_fields:
+            return True
+        return self._mask_field_cached(key)
+
+    def _mask_field_uncached(self, key: str) -> bool:
+        return key.lower() in self.mask_body_fields
+
     def format_endpoint_for_display(self, path: str) -> str:
         """
         Formatiert einen Endpoint-Path für die Anzeige in der UI.
@@ -114,18 +268,27 @@ class TUIConfig:
             strip_prefixes = ["/api/v1"]
             endpoint_replacements = {"zusammenfassung": "zsm"}
             → Result: "/tools/zsm"
+        
+        Ergebnisse werden pro Pfad gecacht; neu zugewiesene strip_prefixes /
+        endpoint_replacements leeren den Cache (In-place Mutationen nicht).
         """
+        return self._format_endpoint_cached(path)
+
+    def _format_endpoint_uncached(self, path: str) -> str:
         formatted = path
         
-        # 1. Strip Prefixes (längste zuerst, um /api/v1 vor /api zu matchen)
-        for prefix in sorted(self.strip_prefixes, key=len, reverse=True):
+        # 1. Strip Prefixes (vorsortiert, längste zuerst)
+        for prefix in self._sorted_strip_prefixes:
             if formatted.startswith(prefix):
                 formatted = formatted[len(prefix):]
                 break  # Nur ersten Match anwenden
         
-        # 2. Apply Replacements
-        for original, replacement in self.endpoint_replacements.items():
-            formatted = formatted.replace(original, replacement)
+        # 2. Apply Replacements (ein Durchlauf über alle Keys, längster Match gewinnt)
+        if self._replacements_pattern is not None:
+            replacements = self.endpoint_replacements
+            formatted = self._replacements_pattern.sub(
+                lambda m: replacements[m.group(0)], formatted
+            )
         
         # Stelle sicher dass der Path mit / beginnt
         if not formatted.startswith("/"):
@@ -135,93 +298,106 @@ class TUIConfig:
 
     def scrub_headers(self, headers: Dict[str, str]) -> Dict[str, str]:
         """Maskiert Header basierend auf der Config."""
-        scrubbed = {}
-        for key, value in headers.items():
-            if key.lower() in self.mask_headers:
-                scrubbed[key] = "***"
-            else:
-                scrubbed[key] = value
+        if not self.mask_headers:
+            return headers
+        should_mask = self.should_mask_header
+        return {
+            key: "***" if should_mask(key) else value
+            for key, value in headers.items()
+        }
+
+    def scrub_headers_lower(self, headers: Dict[str, str]) -> Dict[str, str]:
+        """
+        Wie scrub_headers, aber nur für Header-Dicts mit garantiert kleingeschriebenen
+        Keys (z.B. dict(request.headers) von Starlette): ein Set-Schnitt statt
+        Prüfung jedes einzelnen Keys. Ohne Treffer wird das Dict selbst zurückgegeben.
+        """
+        to_mask = self.mask_headers.intersection(headers)
+        if not to_mask:
+            return headers
+        scrubbed = dict(headers)
+        for key in to_mask:
+            scrubbed[key] = "***"
         return scrubbed
 
     def scrub_data(self, data: Any) -> Any:
         """
-        Rekursive Funktion zum Maskieren von sensiblen Feldern in JSON-Daten.
+        Maskiert sensible Felder in (verschachtelten) JSON-Daten.
+        
+        Copy-on-Write: Teilbäume ohne Treffer werden unverändert (als dasselbe
+        Objekt) übernommen, kopiert werden nur Container auf dem Pfad zu einem
+        maskierten Key. Die Eingabe selbst wird nie verändert.
         """
-        if isinstance(data, dict):
-            return {
-                k: "***" if k.lower() in self.mask_body_fields else self.scrub_data(v)
-                for k, v in data.items()
-            }
-        elif isinstance(data, list):
-            return [self.scrub_data(item) for item in data]
-        else:
+        if not self.mask_body_fields or not isinstance(data, (dict, list)):
             return data
+        return _scrub_copy_on_write(data, self.should_mask_field)
     
     # --- SERIALIZATION METHODS ---
 
     def override_from_cli(self) -> None:
         """CLI Argumente haben Vorrang."""
-        if "--reload" in sys.argv:
+        args = _parse_cli_args()
+        
+        if args.reload:
             self.reload = True
-            
-        for i, arg in enumerate(sys.argv):
-            if arg.startswith("--port="):
-                try:
-                    self.port = int(arg.split("=")[1])
-                except ValueError: pass
-            elif arg == "--port" and i + 1 < len(sys.argv):
-                try:
-                    self.port = int(sys.argv[i+1])
-                except ValueError: pass
-            
-            if arg.startswith("--host="):
-                self.host = arg.split("=")[1]
-            elif arg == "--host" and i + 1 < len(sys.argv):
-                self.host = sys.argv[i+1]
+        
+        if args.port is not None:
+            try:
+                self.port = int(args.port)
+            except ValueError: pass
+        
+        if args.host is not None:
+            self.host = args.host
 
     def to_json_payload(self) -> str:
-        data = asdict(self)
-        # Sets zu Listen konvertieren für JSON
-        data["exclude_paths"] = list(self.exclude_paths)
-        data["exclude_methods"] = list(self.exclude_methods)
-        data["mask_headers"] = list(self.mask_headers)
-        data["mask_body_fields"] = list(self.mask_body_fields)
-        data["log_level"] = self.log_level.value
-        return json.dumps(data)
+        cached = self.__dict__.get("_payload_cache")
+        if cached is not None:
+            return cached
+        
+        # Flaches Dict direkt aus __dict__ statt asdict() (kein rekursives deepcopy).
+        # Der Round-Trip über from_json_payload setzt voraus, dass alle Felder
+        # primitive Werte, Listen/Sets/Dicts davon oder Enums sind.
+        values = self.__dict__
+        data = {name: values[name] for name in self._SERIALIZE_FIELDS}
+        # Sets → Listen und Enums → Werte erledigt _json_default
+        payload = json_dumps(data, default=_json_default)
+        object.__setattr__(self, "_payload_cache", payload)
+        return payload
 
     @classmethod
     def from_json_payload(cls, payload: str) -> "TUIConfig":
-        data = json.loads(payload)
-        # Listen zurück zu Sets
-        if "exclude_paths" in data: data["exclude_paths"] = set(data["exclude_paths"])
-        if "exclude_methods" in data: data["exclude_methods"] = set(data["exclude_methods"])
-        if "mask_headers" in data: data["mask_headers"] = set(data["mask_headers"])
-        if "mask_body_fields" in data: data["mask_body_fields"] = set(data["mask_body_fields"])
+        data = json_loads(payload)
+        # Unbekannte Keys (Payload einer anderen Version) ignorieren statt TypeError
+        if not data.keys() <= cls._FIELD_NAMES:
+            data = {k: v for k, v in data.items() if k in cls._FIELD_NAMES}
+        # Listen → frozensets erledigt __post_init__, nur das Enum zurückwandeln
         if "log_level" in data: data["log_level"] = LogLevel(data["log_level"])
         return cls(**data)
 
     @classmethod
     def from_env(cls) -> "TUIConfig":
+        getenv = os.environ.get
+        
         # Parse strip_prefixes from env (comma-separated)
-        strip_prefixes_str = os.getenv("TUI_STRIP_PREFIXES", "")
+        strip_prefixes_str = getenv("TUI_STRIP_PREFIXES", "")
         strip_prefixes = [p.strip() for p in strip_prefixes_str.split(",") if p.strip()]
         
         # Parse endpoint_replacements from env (JSON string)
-        replacements_str = os.getenv("TUI_ENDPOINT_REPLACEMENTS", "{}")
+        replacements_str = getenv("TUI_ENDPOINT_REPLACEMENTS", "{}")
         try:
-            endpoint_replacements = json.loads(replacements_str)
-        except json.JSONDecodeError:
+            endpoint_replacements = json_loads(replacements_str)
+        except json.JSONDecodeError:  # orjson.JSONDecodeError ist eine Unterklasse
             endpoint_replacements = {}
         
         return cls(
-            host=os.getenv("TUI_HOST", "0.0.0.0"),
-            port=int(os.getenv("TUI_PORT", "8000")),
-            reload=os.getenv("TUI_RELOAD", "").lower() in ("1", "true", "yes"),
-            enable_exceptions=os.getenv("TUI_EXCEPTIONS", "1").lower() in ("1", "true", "yes"),
-            enable_request_logging=os.getenv("TUI_REQUEST_LOGGING", "1").lower() in ("1", "true", "yes"),
-            log_level=LogLevel(os.getenv("TUI_LOG_LEVEL", "info").lower()),
-            db_path=os.getenv("TUI_DB_PATH", "tui_events.db"),
-            enable_persistence=os.getenv("TUI_ENABLE_PERSISTENCE", "1").lower() in ("1", "true", "yes"),
+            host=getenv("TUI_HOST", "0.0.0.0"),
+            port=int(getenv("TUI_PORT", "8000")),
+            reload=_env_flag(getenv, "TUI_RELOAD", False),
+            enable_exceptions=_env_flag(getenv, "TUI_EXCEPTIONS", True),
+            enable_request_logging=_env_flag(getenv, "TUI_REQUEST_LOGGING", True),
+            log_level=LogLevel(getenv("TUI_LOG_LEVEL", "info").lower()),
+            db_path=getenv("TUI_DB_PATH", "tui_events.db"),
+            enable_persistence=_env_flag(getenv, "TUI_ENABLE_PERSISTENCE", True),
             strip_prefixes=strip_prefixes,
             endpoint_replacements=endpoint_replacements,
         )
@@ -233,22 +409,183 @@ class TUIConfig:
         return config
 
 
+_TRUTHY = frozenset({"1", "true", "yes"})
+
+
+def _env_flag(getenv: Callable[..., Optional[str]], key: str, default: bool) -> bool:
+    """Bool aus einer Env-Variable ("1"/"true"/"yes" = an), Default wenn nicht gesetzt."""
+    value = getenv(key)
+    if value is None:
+        return default
+    return value.lower() in _TRUTHY
+
+
+# Felder, aus denen _build_display_caches() abgeleitet wird
+_DISPLAY_FIELDS = frozenset({"strip_prefixes", "endpoint_replacements"})
+
+# Filter-/Masking-Felder → Normalisierung; Zuweisung baut _build_caches() neu auf
+# (Masking-Keys lowercase, der Vergleich ist case-insensitive)
+_FILTER_FIELDS: Dict[str, Callable[[Any], frozenset]] = {
+    "exclude_paths": frozenset,
+    "exclude_methods": frozenset,
+    "mask_headers": lambda keys: frozenset(k.lower() for k in keys),
+    "mask_body_fields": lambda keys: frozenset(k.lower() for k in keys),
+}
+
+
+def _compile_replacements(replacements: Dict[str, str]) -> Optional[re.Pattern]:
+    """
+    Baut eine Alternation aller Replacement-Keys (längste zuerst), damit
+    format_endpoint_for_display den Pfad nur einmal scannt statt einmal pro Key.
+    """
+    keys = [k for k in replacements if k]
+    if not keys:
+        return None
+    keys.sort(key=len, reverse=True)
+    return re.compile("|".join(re.escape(k) for k in keys))
+
+
+def _iter_children(node):
+    return iter(node.items()) if isinstance(node, dict) else enumerate(node)
+
+def _scrub_copy_on_write(data: Any, should_mask: Callable[[str], bool]) -> Any:
+    """Iterative (Stack statt Rekursion) Implementierung von TUIConfig.scrub_data."""
+    # Frame: [Container, Kind-Iterator, Änderungen {key: neuer Wert}, Key im Parent]
+    stack = [(data, _iter_children(data), {}, None)]
+    result = data
+    
+    while stack:
+        node, children, changes, key_in_parent = stack[-1]
+        is_dict = isinstance(node, dict)
+        
+        for key, value in children:
+            if is_dict and isinstance(key, str) and should_mask(key):
+                changes[key] = "***"
+            elif value and isinstance(value, (dict, list)):
+                # Abstieg; der Iterator dieses Frames macht später hier weiter
+                stack.append((value, _iter_children(value), {}, key))
+                break
+        else:
+            # Alle Kinder verarbeitet → Frame abschließen
+            stack.pop()
+            new_node = node
+            if changes:
+                new_node = dict(node) if is_dict else list(node)
+                for key, value in changes.items():
+                    new_node[key] = value
+            
+            if stack:
+                if new_node is not node:
+                    stack[-1][2][key_in_parent] = new_node
+            else:
+                result = new_node
+    
+    return result
+
+
+# Feldnamen einmalig bei Klassendefinition ermitteln (für to_/from_json_payload)
+TUIConfig._SERIALIZE_FIELDS = tuple(f.name for f in fields(TUIConfig))
+TUIConfig._FIELD_NAMES = frozenset(TUIConfig._SERIALIZE_FIELDS)
+
+
+class _LenientArgumentParser(argparse.ArgumentParser):
+    """Wirft statt sys.exit() – fremde/kaputte Argumente dürfen die App nicht beenden."""
+    def error(self, message):
+        raise ValueError(message)
+
+
+@functools.lru_cache(maxsize=1)
+def _parse_cli_args() -> argparse.Namespace:
+    """Parst die TUI-relevanten CLI-Flags einmalig aus sys.argv (Rest wird ignoriert)."""
+    parser = _LenientArgumentParser(add_help=False, allow_abbrev=False)
+    parser.add_argument("--tui", action="store_true")
+    parser.add_argument("--reload", "--dev", dest="reload", action="store_true")
+    parser.add_argument("--port", default=None)
+    parser.add_argument("--host", default=None)
+    try:
+        args, _ = parser.parse_known_args(sys.argv[1:])
+    except ValueError:
+        args = argparse.Namespace(tui="--tui" in sys.argv, reload=False, port=None, host=None)
+    return args
+
+
 # Global config instance
 _config: Optional[TUIConfig] = None
 
-def get_config() -> TUIConfig:
-    global _config
-    if _config is None:
-        payload = os.environ.get("TUI_CONFIG_PAYLOAD")
-        if payload:
+def _read_shared_payload(spec: str) -> Optional[str]:
+    """
+    Liest den Config-Payload aus einem SharedMemory-Block.
+    spec = "<name>:<length>" (siehe TUIRunner._share_config_payload)
+    """
+    from multiprocessing import shared_memory
+    try:
+        name, length = spec.rsplit(":", 1)
+        try:
+            shm = shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+        except TypeError:
+            shm = shared_memory.SharedMemory(name=name)
+            # < 3.13: Auch Leser registrieren sich beim resource_tracker, der den
+            # Block beim Exit dieses Prozesses löschen würde – der nächste
+            # Reload-Kindprozess fände dann nichts mehr. Der Runner räumt auf.
             try:
-                _config = TUIConfig.from_json_payload(payload)
+                from multiprocessing import resource_tracker
+                resource_tracker.unregister(shm._name, "shared_memory")
             except Exception:
-                _config = TUIConfig.from_cli()
-        else:
+                pass
+        try:
+            return bytes(shm.buf[:int(length)]).decode("utf-8")
+        finally:
+            shm.close()
+    except Exception:
+        return None
+
+def _load_initial_config() -> TUIConfig:
+    """Einmalige Auflösung: SharedMemory → Env-Payload → CLI/Env."""
+    global _config
+    payload = None
+    shm_spec = os.environ.get("TUI_CONFIG_SHM")
+    if shm_spec:
+        payload = _read_shared_payload(shm_spec)
+    if not payload:
+        payload = os.environ.get("TUI_CONFIG_PAYLOAD")
+    if payload:
+        try:
+            _config = TUIConfig.from_json_payload(payload)
+        except Exception:
             _config = TUIConfig.from_cli()
+    else:
+        _config = TUIConfig.from_cli()
     return _config
 
+def get_config() -> TUIConfig:
+    # Hot Path (pro Request/Log aufgerufen): nur ein Global-Lookup
+    config = _config
+    if config is None:
+        config = _load_initial_config()
+    return config
+
+# Wird beim Server-Start (configure_tui → connect_tui) gesetzt
+_config_frozen = False
+
+def freeze_config() -> TUIConfig:
+    """
+    Fixiert die aktuelle Config für die Laufzeit des Servers.
+    Middleware & Co. haben ab hier ihre Referenzen/Methoden gebunden.
+    """
+    global _config_frozen
+    config = get_config()
+    _config_frozen = True
+    return config
+
 def set_config(config: TUIConfig) -> None:
     global _config
+    if _config_frozen:
+        warnings.warn(
+            "set_config() called after the TUI was started; "
+            "already running middleware keeps using the previous config.",
+            RuntimeWarning,
+            stacklevel=2
+        )
+    # Gecachte Entscheidungen verwerfen (Config könnte vorher mutiert worden sein)
+    config._build_caches()
     _config = config
\ No newline at end of file
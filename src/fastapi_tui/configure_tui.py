@@ -1,14 +1,16 @@
 import sys
 import logging
+from contextlib import asynccontextmanager
 from datetime import datetime
 from multiprocessing import Queue as MPQueue
+from typing import Optional
 from fastapi import FastAPI
 
-from .loggers.server_logger import init_logger
-from .ipc import get_queue_client
-from .middleware import TUIMiddleware
+from .loggers.server_logger import init_logger, get_sender, write_server_log, BridgeLogger
+from .ipc import get_queue_client, is_tui_ipc_configured
+from .middleware import TUIMiddleware, TUIFusedMiddleware, CORSConfig
 # NEU: Config importieren
-from .config import get_config
+from .config import get_config, freeze_config
 
 def setup_tui_logging(queue: MPQueue):
     """
@@ -25,32 +27,9 @@ def setup_tui_logging(queue: MPQueue):
     # 1. Basis Logger initialisieren
     init_logger(queue)
     
-    def send_log_to_queue(msg: str, level: str, log_type: str = None):
-        try:
-            queue.put({
-                "type": "log",
-                "data": {
-                    "level": level,
-                    "message": msg,
-                    "timestamp": datetime.now(),
-                    "type": log_type or level
-                }
-            })
-        except Exception:
-            pass
-
-    # 2. Stdout/Stderr umleiten
-    class BridgeLogger:
-        def write(self, msg):
-            try:
-                if msg and msg.strip():
-                    send_log_to_queue(msg.strip(), "PRINT", "PRINT")
-            except Exception: pass 
-        def flush(self): pass
-        def isatty(self): return False
-        
-    sys.stdout = BridgeLogger()
-    sys.stderr = BridgeLogger()
+    # 2. Stdout/Stderr umleiten (zeilenweise gepuffert, gebündelt gesendet)
+    sys.stdout = BridgeLogger("PRINT")
+    sys.stderr = BridgeLogger("PRINT")
 
     # 3. TUI Handler (Queue)
     class TUILogHandler(logging.Handler):
@@ -60,7 +39,9 @@ def setup_tui_logging(queue: MPQueue):
                 log_type = "UVICORN"
                 if "access" in record.name: log_type = "ACCESS"
                 elif "error" in record.name: log_type = "ERROR"
-                send_log_to_queue(msg, record.levelname, log_type)
+                # Geht über den Sender-Thread von init_logger (kein Queue-Put pro Record),
+                # Zeitstempel aus dem Record statt erneut datetime.now()
+                write_server_log(msg, record.levelname, log_type, datetime.fromtimestamp(record.created))
             except Exception: pass
 
     tui_handler = TUILogHandler()
@@ -90,20 +71,86 @@ def setup_tui_logging(queue: MPQueue):
         logger.propagate = False
         logger.setLevel(target_level) # NEU: Level aus Config
 
-def create_tui_app(app: FastAPI) -> FastAPI:
+# Queue-Verbindung des aktuellen Prozesses (wird einmalig beim Server-Start aufgebaut)
+_tui_queue = None
+_tui_connected = False
+
+def connect_tui():
+    """
+    Verbindet einmalig mit der TUI-Queue und richtet das Logging ein.
+    Idempotent: weitere Aufrufe geben nur die (evtl. None) Queue zurück.
+    """
+    global _tui_queue, _tui_connected
+    if not _tui_connected:
+        _tui_connected = True
+        freeze_config()
+        queue = get_queue_client()
+        if queue:
+            setup_tui_logging(queue)
+            # Alle Producer (Middleware, Runtime-/Exception-Logs) schreiben in den
+            # lokalen Sender statt direkt auf den Manager-Proxy: kein blockierender
+            # Socket-Roundtrip im Event-Loop, eine Reihenfolge für alle Events
+            _tui_queue = get_sender()
+    return _tui_queue
+
+def _wrap_lifespan(app: FastAPI) -> None:
+    """Hängt connect_tui() vor den bestehenden Lifespan der App."""
+    original_lifespan = app.router.lifespan_context
+
+    @asynccontextmanager
+    async def tui_lifespan(asgi_app):
+        connect_tui()
+        async with original_lifespan(asgi_app) as state:
+            yield state
+
+    app.router.lifespan_context = tui_lifespan
+
+def create_tui_app(app: FastAPI, *, cors: Optional[CORSConfig] = None) -> FastAPI:
     """
     Instrumentiert eine FastAPI-Anwendung mit der TUI-Middleware und Logging.
     Gibt die modifizierte App zurück, um Chaining zu ermöglichen.
     
+    Die eigentliche Verdrahtung (IPC-Verbindung, Logging-Umleitung) passiert
+    erst beim Server-Start im Lifespan, wenn alle Router eingebunden sind.
+    Ein reiner Import der App (z.B. für das Endpoint-Preloading im Runner)
+    hat dadurch keine Seiteneffekte mehr.
+    
+    Mit `cors` wird statt CORSMiddleware + TUIMiddleware + Exception-Handler
+    nur EINE Middleware registriert (TUIFusedMiddleware). Ohne TUI Runner
+    wird dann nur Starlettes CORSMiddleware eingehängt.
+    
     Usage:
         app = FastAPI()
         app = create_tui_app(app)
+        app = create_tui_app(app, cors=CORSConfig(allow_origins=["*"]))
     """
-    # Queue holen (nur vorhanden, wenn via TUI Runner gestartet)
-    log_queue = get_queue_client()
-    if log_queue:
-        setup_tui_logging(log_queue)
-        app.add_middleware(TUIMiddleware, queue=log_queue)
+    # Nur einmal pro App installieren (sonst doppelte Middleware / CORS)
+    if getattr(app, "_tui_installed", False):
+        return app
+    app._tui_installed = True
+    
+    # Nur aktiv, wenn via TUI Runner gestartet
+    if is_tui_ipc_configured():
+        _wrap_lifespan(app)
+        # Queue wird von der Middleware lazy über connect_tui() geholt
+        if cors is not None:
+            app.add_middleware(TUIFusedMiddleware, cors=cors)
+        else:
+            app.add_middleware(TUIMiddleware)
+    elif cors is not None:
+        from starlette.middleware.cors import CORSMiddleware
+        app.add_middleware(CORSMiddleware, **cors.as_middleware_kwargs())
     return app
 
-configure_tui = create_tui_app
\ No newline at end of file
+configure_tui = create_tui_app
+
+def install_tui(app: FastAPI, *, cors: bool = True, cors_kwargs: Optional[dict] = None) -> FastAPI:
+    """
+    Registriert TUI + CORS in der richtigen Reihenfolge mit einem Aufruf,
+    ohne separates app.add_middleware(CORSMiddleware, ...) im User-Code.
+    
+    Usage:
+        app = install_tui(app, cors_kwargs={"allow_origins": ["*"], "allow_methods": ["*"]})
+    """
+    cors_config = CORSConfig(**(cors_kwargs or {})) if cors else None
+    return create_tui_app(app, cors=cors_config)
\ No newline at end of file
@@ -17,7 +17,9 @@ from .events import (
     create_completed_hit,
     create_custom_event,
     parse_event,
-    normalize_endpoint
+    normalize_endpoint,
+    RouteIndex,
+    get_route_index
 )
 
 __all__ = [
@@ -34,4 +36,6 @@ __all__ = [
     "create_custom_event",
     "parse_event",
     "normalize_endpoint",
+    "RouteIndex",
+    "get_route_index",
 ]
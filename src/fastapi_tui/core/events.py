@@ -4,16 +4,49 @@ TUI Core - Events
 Event parsing, creation, and utility functions.
 """
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 from datetime import datetime
-import uuid
+import itertools
+import os
+import secrets
 
 from .models import EndpointHit, CustomEvent, EndpointStats, EventType
 
+try:
+    from starlette.routing import Match
+except ImportError:  # Core ist auch ohne Starlette nutzbar
+    Match = None
+
+# Vorlage für den Mock-Scope in normalize_endpoint (pro Aufruf nur kopiert)
+_MATCH_SCOPE_TEMPLATE = {
+    "type": "http",
+    "path": "/",
+    "method": "GET"
+}
+
+
+# Hit-IDs: fortlaufender Zähler + zufälliger Prozess-Prefix.
+# Eindeutig über Prozesse/Sessions hinweg (IDs sind Primary Key in der DB),
+# ohne pro Request os.urandom + UUID-Formatierung. Der Zähler steht vorne,
+# damit die in der UI gekürzte ID (die ersten 8 Zeichen) unterscheidbar bleibt.
+_hit_counter = itertools.count(1)
+_hit_id_suffix = secrets.token_hex(8)
+
+
+def _reset_hit_ids() -> None:
+    global _hit_counter, _hit_id_suffix
+    _hit_counter = itertools.count(1)
+    _hit_id_suffix = secrets.token_hex(8)
+
+
+if hasattr(os, "register_at_fork"):
+    # Geforkte Worker dürfen nicht dieselbe ID-Folge erzeugen
+    os.register_at_fork(after_in_child=_reset_hit_ids)
+
 
 def create_hit_id() -> str:
     """Generate a unique hit ID"""
-    return str(uuid.uuid4())
+    return f"{next(_hit_counter):08x}-{_hit_id_suffix}"
 
 
 def create_pending_hit(
@@ -26,7 +59,10 @@ def create_pending_hit(
     request_headers: Optional[Dict[str, str]] = None,
     timestamp: Optional[datetime] = None
 ) -> EndpointHit:
-    """Create a pending hit (request received, not yet responded)"""
+    """
+    Create a pending hit (request received, not yet responded).
+    Ist der Request-Start bekannt, als `timestamp` übergeben (spart datetime.now()).
+    """
     return EndpointHit(
         id=request_id,
         endpoint=endpoint,
@@ -80,7 +116,7 @@ def create_custom_event(
 ) -> CustomEvent:
     """Create a custom event for logging"""
     return CustomEvent(
-        id=str(uuid.uuid4()),
+        id=create_hit_id(),
         endpoint=endpoint,
         message=message,
         data=data,
@@ -100,25 +136,89 @@ def parse_event(raw_event: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-def normalize_endpoint(path: str, app_routes: list = None) -> str:
+class RouteIndex:
+    """
+    Gruppiert Routen nach ihrem ersten statischen Pfad-Segment.
+    
+    Statt für jeden Request alle Routen per Regex zu prüfen, werden nur die
+    Routen mit passendem erstem Segment plus alle "dynamischen" Routen
+    (Parameter im ersten Segment, Root-Mounts, Host-Routen, ...) geprüft –
+    in der ursprünglichen Reihenfolge, damit der erste Treffer derselbe bleibt.
+    """
+    
+    def __init__(self, routes: Sequence[Any]):
+        self.routes = routes
+        self.size = len(routes)
+        
+        static: Dict[str, List[Tuple[int, Any]]] = {}
+        dynamic: List[Tuple[int, Any]] = []
+        for position, route in enumerate(routes):
+            segment = _first_static_segment(getattr(route, "path", None))
+            if segment is None:
+                dynamic.append((position, route))
+            else:
+                static.setdefault(segment, []).append((position, route))
+        
+        self._dynamic = tuple(route for _, route in dynamic)
+        self._buckets = {
+            segment: tuple(route for _, route in sorted(entries + dynamic, key=lambda e: e[0]))
+            for segment, entries in static.items()
+        }
+    
+    def is_current(self, routes: Sequence[Any]) -> bool:
+        """Ob der Index noch zur (evtl. nachträglich erweiterten) Routen-Liste passt."""
+        return self.routes is routes and self.size == len(routes)
+    
+    def candidates(self, path: str) -> Tuple[Any, ...]:
+        """Routen, die für diesen Pfad matchen könnten (in Original-Reihenfolge)."""
+        return self._buckets.get(path[1:].partition("/")[0], self._dynamic)
+
+
+def _first_static_segment(route_path: Optional[str]) -> Optional[str]:
+    if not route_path or not route_path.startswith("/"):
+        return None
+    segment = route_path[1:].partition("/")[0]
+    if "{" in segment:
+        return None
+    return segment
+
+
+def get_route_index(app: Any) -> RouteIndex:
+    """RouteIndex einer App (auf app.state gecacht, neu gebaut wenn Routen dazukommen)."""
+    routes = app.routes
+    index = getattr(app.state, "_tui_route_index", None)
+    if index is None or not index.is_current(routes):
+        index = RouteIndex(routes)
+        app.state._tui_route_index = index
+    return index
+
+
+# normalize_endpoint bekommt nur die Routen-Liste → Index pro Liste merken
+_route_indexes: Dict[int, RouteIndex] = {}
+
+
+def normalize_endpoint(path: str, app_routes: list = None, scope: Optional[Dict[str, Any]] = None) -> str:
     """
     Normalize an endpoint path to its route template.
     E.g., /items/123 -> /items/{id}
+    
+    Aus einer Middleware heraus den echten ASGI-`scope` mitgeben: dann wird
+    dieser (inkl. Methode) zum Matchen genutzt statt ein Mock-Scope gebaut.
     """
-    if not app_routes:
+    if not app_routes or Match is None:
         return path
     
     try:
-        from starlette.routing import Match
+        index = _route_indexes.get(id(app_routes))
+        if index is None or not index.is_current(app_routes):
+            index = _route_indexes[id(app_routes)] = RouteIndex(app_routes)
         
-        # Create a mock scope for matching
-        scope = {
-            "type": "http",
-            "path": path,
-            "method": "GET"
-        }
+        if scope is None:
+            # Create a mock scope for matching
+            scope = _MATCH_SCOPE_TEMPLATE.copy()
+            scope["path"] = path
         
-        for route in app_routes:
+        for route in index.candidates(path):
             if hasattr(route, 'matches'):
                 match, _ = route.matches(scope)
                 if match == Match.FULL:
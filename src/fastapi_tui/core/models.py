@@ -4,9 +4,11 @@ TUI Core - Models
 Pydantic models for the TUI system.
 """
 
+from bisect import bisect_left, insort
+from collections import deque
 from datetime import datetime
-from typing import Any, Dict, Optional, List
-from pydantic import BaseModel, Field
+from typing import Any, Deque, Dict, Iterable, Optional, List
+from pydantic import BaseModel, Field, PrivateAttr, computed_field, field_validator
 from enum import Enum
 
 
@@ -30,13 +32,16 @@ class EndpointHit(BaseModel):
     client: str = "unknown"
     
     # Request Details
-    request_params: Optional[Dict[str, Any]] = None
-    request_body: Optional[Dict[str, Any]] = None
-    request_headers: Optional[Dict[str, str]] = None
+    # Payload-Felder bewusst als Any: Pydantic würde Dict[...] bei jedem Hit
+    # komplett durchlaufen und kopieren (teuer bei großen Bodies), außerdem
+    # sind JSON-Bodies nicht immer Objekte (Arrays, Strings, ...).
+    request_params: Optional[Any] = None     # Dict[str, Any]
+    request_body: Optional[Any] = None       # JSON (meist Dict[str, Any])
+    request_headers: Optional[Any] = None    # Dict[str, str]
     
     # Response Details
-    response_body: Optional[Dict[str, Any]] = None
-    response_headers: Optional[Dict[str, str]] = None
+    response_body: Optional[Any] = None      # JSON (meist Dict[str, Any])
+    response_headers: Optional[Any] = None   # Dict[str, str]
     
     # Custom Runtime Logs
     runtime_logs: List[Any] = Field(default_factory=list)
@@ -48,6 +53,10 @@ class EndpointHit(BaseModel):
     pending: bool = True
     error: Optional[str] = None
     
+    # Beim Pending-Save erzeugtes model_dump(): der Abschluss ändert nur ein
+    # paar Felder darin, statt das ganze Model erneut zu serialisieren
+    _saved: Optional[Dict[str, Any]] = PrivateAttr(default=None)
+    
     class Config:
         json_encoders = {
             datetime: lambda v: v.isoformat()
@@ -61,7 +70,7 @@ class CustomEvent(BaseModel):
     event_type: EventType = EventType.CUSTOM
     timestamp: datetime = Field(default_factory=datetime.now)
     message: str
-    data: Optional[Dict[str, Any]] = None
+    data: Optional[Any] = None  # Dict[str, Any], ungeprüft übernommen
     level: str = "info"
     
     class Config:
@@ -70,6 +79,58 @@ class CustomEvent(BaseModel):
         }
 
 
+# Anzahl der letzten Durations, über die die Percentiles berechnet werden
+DURATION_WINDOW = 1000
+
+# Ab so vielen Änderungen seit dem letzten Lesen wird komplett neu sortiert
+# statt einzeln per insort nachzuziehen
+_RESORT_THRESHOLD = 64
+
+
+class _DurationWindow:
+    """
+    Sortierte Sicht auf EndpointStats.durations, die erst beim Lesen nachgezogen wird.
+    
+    record() merkt sich pro Hit nur neue/verdrängte Werte (O(1)); view() zieht
+    wenige Änderungen per insort nach und sortiert nach langen Lese-Pausen
+    einmal komplett neu.
+    """
+    __slots__ = ("sorted", "added", "evicted", "resort")
+    
+    def __init__(self, durations: Iterable[float] = ()):
+        self.sorted: List[float] = sorted(durations)
+        self.added: List[float] = []
+        self.evicted: List[float] = []
+        self.resort = False
+    
+    def record(self, durations: Deque[float], value: float) -> None:
+        """Vor durations.append(value) aufrufen."""
+        if self.resort:
+            return
+        if len(durations) == durations.maxlen:
+            self.evicted.append(durations[0])
+        self.added.append(value)
+        if len(self.added) > _RESORT_THRESHOLD:
+            self.resort = True
+            self.added.clear()
+            self.evicted.clear()
+    
+    def view(self, durations: Deque[float]) -> List[float]:
+        if self.resort:
+            self.sorted = sorted(durations)
+            self.resort = False
+        elif self.added:
+            # Verdrängte Werte sind älter als alle neuen, stehen also schon drin
+            window = self.sorted
+            for value in self.evicted:
+                del window[bisect_left(window, value)]
+            for value in self.added:
+                insort(window, value)
+            self.added.clear()
+            self.evicted.clear()
+        return self.sorted
+
+
 class EndpointStats(BaseModel):
     """Statistics for an endpoint"""
     endpoint: str
@@ -77,15 +138,48 @@ class EndpointStats(BaseModel):
     success_count: int = 0
     error_count: int = 0
     avg_duration_ms: float = 0.0
+    duration_count: int = 0  # Anzahl Hits mit Duration (Basis für avg_duration_ms)
     min_duration_ms: Optional[float] = None
     max_duration_ms: Optional[float] = None
     last_hit: Optional[datetime] = None
     status_codes: Dict[int, int] = Field(default_factory=dict)
     
-    durations: List[float] = Field(default_factory=list)
-    p50: float = 0.0
-    p95: float = 0.0
-    p99: float = 0.0
+    durations: Deque[float] = Field(default_factory=lambda: deque(maxlen=DURATION_WINDOW))
+    
+    # Percentiles werden erst beim Lesen aktualisiert (UI liest seltener als Hits
+    # reinkommen), siehe _DurationWindow
+    _window: _DurationWindow = PrivateAttr(default_factory=_DurationWindow)
+    
+    @field_validator("durations", mode="after")
+    @classmethod
+    def _bounded_durations(cls, value: Deque[float]) -> Deque[float]:
+        # Validierte Listen/Deques verlieren sonst das maxlen
+        if value.maxlen != DURATION_WINDOW:
+            value = deque(value, maxlen=DURATION_WINDOW)
+        return value
+    
+    def model_post_init(self, __context: Any) -> None:
+        if self.durations:
+            self._window = _DurationWindow(self.durations)
+    
+    @computed_field
+    @property
+    def p50(self) -> float:
+        return self._percentile(0.5)
+    
+    @computed_field
+    @property
+    def p95(self) -> float:
+        return self._percentile(0.95)
+    
+    @computed_field
+    @property
+    def p99(self) -> float:
+        return self._percentile(0.99)
+    
+    def _percentile(self, q: float) -> float:
+        window = self._window.view(self.durations)
+        return window[int(len(window) * q)] if window else 0.0
     
     def update(self, hit: EndpointHit, count_hit: bool = True) -> None:
         """Update statistics with a new hit"""
@@ -102,32 +196,23 @@ class EndpointStats(BaseModel):
             self.status_codes[hit.status_code] = self.status_codes.get(hit.status_code, 0) + 1
         
         if hit.duration_ms is not None:
-            # Add to history (keep last 1000 for memory efficiency)
-            self.durations.append(hit.duration_ms)
-            if len(self.durations) > 1000:
-                self.durations.pop(0)
+            # Add to history (deque verwirft den ältesten Wert selbst, O(1))
+            duration = hit.duration_ms
+            self._window.record(self.durations, duration)
+            self.durations.append(duration)
             
-            # Calculate Averages
-            if self.avg_duration_ms == 0:
-                self.avg_duration_ms = hit.duration_ms
-            else:
-                self.avg_duration_ms = (
-                    (self.avg_duration_ms * (self.total_hits - 1) + hit.duration_ms) 
-                    / self.total_hits
-                )
+            # Running Mean (Welford-Update): numerisch stabil und nur über Hits
+            # mit Duration – pending Hits zählen in total_hits, aber nicht hier
+            count = self.duration_count + 1
+            self.duration_count = count
+            self.avg_duration_ms += (duration - self.avg_duration_ms) / count
             
-            if self.min_duration_ms is None or hit.duration_ms < self.min_duration_ms:
-                self.min_duration_ms = hit.duration_ms
-            if self.max_duration_ms is None or hit.duration_ms > self.max_duration_ms:
-                self.max_duration_ms = hit.duration_ms
-                
-            # Calculate Percentiles (if we have enough data)
-            if self.durations:
-                sorted_durations = sorted(self.durations)
-                n = len(sorted_durations)
-                self.p50 = sorted_durations[int(n * 0.5)]
-                self.p95 = sorted_durations[int(n * 0.95)]
-                self.p99 = sorted_durations[int(n * 0.99)]
+            if self.min_duration_ms is None:
+                self.min_duration_ms = self.max_duration_ms = duration
+            elif duration < self.min_duration_ms:
+                self.min_duration_ms = duration
+            elif duration > self.max_duration_ms:
+                self.max_duration_ms = duration
     
     class Config:
         json_encoders = {
@@ -151,8 +236,8 @@ class SystemStats(BaseModel):
     """System statistics"""
     cpu_percent: float = 0.0
     memory_percent: float = 0.0
-    memory_used_mb: float = 0.0
-    memory_total_mb: float = 0.0
+    memory_used_mb: int = 0   # ganze MB (Anzeige ist ohnehin ganzzahlig)
+    memory_total_mb: int = 0
     active_connections: int = 0
     uptime_seconds: float = 0.0
     timestamp: datetime = Field(default_factory=datetime.now)
@@ -2,12 +2,13 @@
 Utility functions for FastAPI exception handlers with TUI logging support.
 """
 
+import logging
+import time
+import traceback
 from typing import Optional, Dict, Any
-from datetime import datetime
 from starlette.requests import Request
 from fastapi.responses import JSONResponse
 
-# NEU: Config importieren
 from .config import get_config
 
 from .loggers.runtime_logger import (
@@ -19,99 +20,167 @@ from .loggers.runtime_logger import (
 )
 from .loggers.exception_logger import (
     capture_exception,
-    get_error_response_detail,
-    # is_dev_mode entfernt
-    ExceptionInfo
+    ExceptionInfo,
+    _GENERIC_ERROR_DETAIL,
+    _TRACEBACK_NOT_CAPTURED
 )
 
 
+logger = logging.getLogger(__name__)
+
+# Standard-CORS-Header der Fehler-Responses (JSONResponse kopiert sie, Wiederverwenden ist sicher)
+_CORS_HEADERS_STAR = {
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Credentials": "true",
+    "Access-Control-Allow-Methods": "*",
+    "Access-Control-Allow-Headers": "*",
+}
+
+# Einmal gebundene Methoden für den Exception-Pfad (spart Attribut-Lookups pro Aufruf)
+_perf_counter = time.perf_counter
+_get_log_queue = log_queue_ctx.get
+_set_log_queue = log_queue_ctx.set
+_set_request_id = request_id_ctx.set
+_set_runtime_logs = runtime_logs_ctx.set
+
+
 def restore_tui_context(request: Request) -> bool:
     """
     Restores TUI context variables from request.state if available.
     """
-    if not hasattr(request.state, "tui_log_queue"):
+    # getattr statt hasattr: ein Lookup, keine Exception-Runde bei fehlendem Attribut
+    state = request.state
+    queue = getattr(state, "tui_log_queue", None)
+    if queue is None:
         return False
     
-    try:
-        current_queue = log_queue_ctx.get()
-        if current_queue is None:
-            log_queue_ctx.set(request.state.tui_log_queue)
-            request_id_ctx.set(request.state.tui_request_id)
-            runtime_logs_ctx.set(request.state.tui_runtime_logs)
-            return True
-        else:
-            return False
-    except Exception as e:
-        print(f"[TUI] Error restoring context: {e}")
+    # log_queue_ctx hat default=None → get() wirft nie, kein try nötig
+    if _get_log_queue() is not None:
         return False
+    
+    _set_log_queue(queue)
+    _set_request_id(getattr(state, "tui_request_id", None))
+    # tui_runtime_logs setzt die Middleware erst im finally; fehlt es, frische Liste
+    runtime_logs = getattr(state, "tui_runtime_logs", None)
+    _set_runtime_logs(runtime_logs if runtime_logs is not None else [])
+    return True
 
 
 def send_exception_to_tui(
     request: Request,
-    exc_info: ExceptionInfo,
+    exc_info: Optional[ExceptionInfo],
     error_content: Dict[str, Any],
-    status_code: int = 500
+    status_code: int = 500,
+    include_exception: bool = False,
+    endpoint: Optional[str] = None,
+    method: Optional[str] = None
 ) -> None:
     """
     Sends exception and request completion update to TUI queue.
+    `endpoint`/`method` können mitgegeben werden, wenn der Aufrufer sie schon hat.
+    
+    include_exception=True: exc_info wurde mit capture_exception(send_to_tui=False)
+    erfasst und geht hier zusammen mit dem Abschluss als EIN "batch" Event raus.
     """
-    if not (hasattr(request.state, "tui_log_queue") and hasattr(request.state, "tui_request_id")):
+    state = request.state
+    queue = getattr(state, "tui_log_queue", None)
+    req_id = getattr(state, "tui_request_id", None)
+    if queue is None or req_id is None:
         return
     
     try:
-        queue = request.state.tui_log_queue
-        req_id = request.state.tui_request_id
-        start_time = getattr(request.state, "tui_start_time", datetime.now())
-        duration = (datetime.now() - start_time).total_seconds() * 1000
+        start_counter = getattr(state, "tui_start_counter", None)
+        if start_counter is not None:
+            duration = (_perf_counter() - start_counter) * 1000
+        else:
+            duration = 0.0
         
-        # Send request completion update
-        queue.put_nowait({
-            "type": "request",
-            "data": {
-                "id": req_id,
-                "endpoint": str(request.url.path),
-                "method": request.method,
-                "status_code": status_code,
-                "duration_ms": duration,
-                "response_body": error_content,
-                "runtime_logs": get_runtime_logs(),
-                "completed": True,
-            }
-        })
+        data = {
+            "id": req_id,
+            "endpoint": endpoint if endpoint is not None else _endpoint_of(request),
+            "method": method if method is not None else request.method,
+            "status_code": status_code,
+            "duration_ms": duration,
+            "response_body": error_content,
+            "completed": True,
+        }
+        # Leere Logs nicht mitschicken – die TUI nimmt ohne Key ohnehin []
+        runtime_logs = get_runtime_logs()
+        if runtime_logs:
+            data["runtime_logs"] = runtime_logs
+        completion = {"type": "request", "data": data}
+        
+        # Send request completion update (mit Exception gebündelt: ein Put statt zwei)
+        if include_exception and exc_info is not None and get_config().enable_exceptions:
+            queue.put_nowait({
+                "type": "batch",
+                "data": [
+                    {"type": "exception", "data": exc_info.model_dump()},
+                    completion
+                ]
+            })
+        else:
+            queue.put_nowait(completion)
         
-    except Exception as e:
-        print(f"[TUI] Error updating TUI request status: {e}")
+    except Exception:
+        logger.exception("[TUI] Error updating TUI request status")
+
+
+def _format_traceback(exc: Exception, exc_info: Optional[ExceptionInfo]) -> str:
+    # capture_exception hat im Dev Mode schon formatiert → wiederverwenden
+    if exc_info is not None and exc_info.traceback_str and exc_info.traceback_str != _TRACEBACK_NOT_CAPTURED:
+        return exc_info.traceback_str
+    # Sonst ohne vorgezogenes Quellzeilen-Lesen (linecache) formatieren
+    te = traceback.TracebackException.from_exception(exc, capture_locals=False, lookup_lines=False)
+    return "".join(te.format())
 
 
 def build_error_response(
     exc: Exception,
-    exc_info: ExceptionInfo,
-    include_traceback: bool = None
+    exc_info: Optional[ExceptionInfo],
+    include_traceback: bool = None,
+    error_message: str = "Internal Server Error"
 ) -> Dict[str, Any]:
     """
     Builds error response content based on config (enable_exceptions).
+    `error_message` landet direkt im "error" Feld (kein Überschreiben danach).
+    Ohne `exc_info` (TUI nicht aktiv) wird der Typ direkt von `exc` genommen.
     """
-    import traceback
-    
-    # NEU: Config nutzen statt is_dev_mode()
-    config = get_config()
+    # Flag einmal lesen (get_config ist nur ein Global-Lookup, bleibt aber
+    # aktuell, falls enable_exceptions zur Laufzeit umgestellt wird)
+    enable_exceptions = get_config().enable_exceptions
     
     if include_traceback is None:
-        include_traceback = config.enable_exceptions
+        include_traceback = enable_exceptions
     
     error_content = {
-        "error": "Internal Server Error",
-        "detail": get_error_response_detail(exc), # Das nutzt intern auch schon config
+        "error": error_message,
+        # entspricht get_error_response_detail(exc), ohne zweiten Config-Lookup
+        "detail": str(exc) if enable_exceptions else _GENERIC_ERROR_DETAIL,
         # Exception Type nur anzeigen, wenn Exceptions aktiviert sind
-        "exception_type": exc_info.exception_type if config.enable_exceptions else None
+        "exception_type": (
+            (exc_info.exception_type if exc_info is not None else type(exc).__name__)
+            if enable_exceptions else None
+        )
     }
     
     if include_traceback:
-        error_content["traceback"] = traceback.format_exc()
+        error_content["traceback"] = _format_traceback(exc, exc_info)
     
     return error_content
 
 
+def _endpoint_of(request: Request) -> str:
+    """Route-Template aus der Middleware (wie im Pending-Event), sonst der URL-Pfad."""
+    endpoint = getattr(request.state, "tui_endpoint", None)
+    return endpoint if endpoint is not None else str(request.url.path)
+
+
+def _tui_attached(request: Request) -> bool:
+    """Ob für diesen Request eine TUI-Queue existiert (request.state oder Context)."""
+    return getattr(request.state, "tui_log_queue", None) is not None or _get_log_queue() is not None
+
+
 def create_cors_json_response(
     content: Dict[str, Any],
     status_code: int = 500,
@@ -120,15 +189,14 @@ def create_cors_json_response(
     """
     Creates a JSONResponse with CORS headers.
     """
+    if cors_origins == "*":
+        headers = _CORS_HEADERS_STAR
+    else:
+        headers = {**_CORS_HEADERS_STAR, "Access-Control-Allow-Origin": cors_origins}
     return JSONResponse(
         status_code=status_code,
         content=content,
-        headers={
-            "Access-Control-Allow-Origin": cors_origins,
-            "Access-Control-Allow-Credentials": "true",
-            "Access-Control-Allow-Methods": "*",
-            "Access-Control-Allow-Headers": "*",
-        }
+        headers=headers
     )
 
 
@@ -142,26 +210,70 @@ def handle_exception_with_tui(
     """
     Complete exception handling pipeline with TUI logging.
     """
+    # Ohne TUI (keine Middleware-Queue): nur die Response bauen
+    if not _tui_attached(request):
+        return create_cors_json_response(
+            build_error_response(exc, None, error_message=error_message), status_code
+        )
+    
     # Step 1: Restore context
     restore_tui_context(request)
     
+    config = get_config()
+    
     # Step 2: Log to runtime (optional)
-    if log_to_runtime:
+    # Ohne TUI kommen wir hier nicht hin (s.o.); bei abgeschalteten Runtime-Logs
+    # str(exc) gar nicht erst formatieren (kann teuer sein, z.B. SQL-Fehler)
+    if log_to_runtime and config.enable_runtime_logs:
         add_runtime_log(f"Exception from Handler: {exc}")
     
     # Step 3: Capture exception
-    exc_info = capture_exception(
-        exc,
-        endpoint=str(request.url.path),
-        method=request.method
-    )
+    # Exception-Event wird in Step 5 zusammen mit dem Abschluss gesendet.
+    # Ohne enable_exceptions liest niemand das ExceptionInfo → gar nicht erst bauen
+    endpoint = _endpoint_of(request)
+    method = request.method
+    exc_info = None
+    if config.enable_exceptions:
+        exc_info = capture_exception(
+            exc,
+            endpoint=endpoint,
+            method=method,
+            send_to_tui=False
+        )
     
     # Step 4: Build error response
-    error_content = build_error_response(exc, exc_info)
-    error_content["error"] = error_message  # Override default message
+    error_content = build_error_response(exc, exc_info, error_message=error_message)
     
     # Step 5: Send to TUI
-    send_exception_to_tui(request, exc_info, error_content, status_code)
+    send_exception_to_tui(
+        request, exc_info, error_content, status_code,
+        include_exception=True, endpoint=endpoint, method=method
+    )
     
     # Step 6: Return response
-    return create_cors_json_response(error_content, status_code)
\ No newline at end of file
+    return create_cors_json_response(error_content, status_code)
+
+
+def make_exception_handler(
+    error_message: str = "Internal Server Error",
+    status_code: int = 500,
+    log_to_runtime: bool = True
+):
+    """
+    Creates an exception handler for `app.add_exception_handler(Exception, ...)`.
+    
+    Delegates to handle_exception_with_tui with the bound arguments, so
+    there is only one error pipeline.
+    
+    Usage:
+        app.add_exception_handler(Exception, make_exception_handler("Internal Server Error"))
+    """
+    async def tui_exception_handler(request: Request, exc: Exception) -> JSONResponse:
+        return handle_exception_with_tui(
+            request, exc,
+            status_code=status_code,
+            error_message=error_message,
+            log_to_runtime=log_to_runtime
+        )
+
+    return tui_exception_handler
\ No newline at end of file
@@ -3,10 +3,13 @@ FastAPI TUI - Haupt-TUI-Anwendung mit Reactive State (OPTIMIERT)
 """
 
 import asyncio
+import json
+import logging
+import time
 from datetime import datetime
-from typing import Dict, Optional, Any
-import uuid
-from queue import Queue
+from collections import OrderedDict, deque
+from typing import Callable, Deque, Dict, List, Optional, Any, Set, Tuple
+from queue import Queue, Empty, SimpleQueue
 import threading
 
 from textual.app import App, ComposeResult
@@ -27,6 +30,7 @@ from .widgets.session_manager import SessionManager
 from .config import get_config
 from .persistence import get_persistence
 from .core.models import EndpointHit, CustomEvent, EndpointStats, TUIEvent, SystemStats
+from .core.events import create_hit_id
 
 try:
     import psutil
@@ -34,6 +38,55 @@ except ImportError:
     psutil = None
 
 
+logger = logging.getLogger(__name__)
+
+
+# Obergrenzen pro process_events-Durchlauf: bei Event-Stürmen blockiert das
+# Abarbeiten sonst die UI (kein Repaint, keine Eingaben). Der Rest folgt direkt
+# im nächsten Durchlauf, nachdem Textual anstehende Nachrichten verarbeitet hat.
+MAX_EVENTS_PER_TICK = 64
+MAX_TICK_SECONDS = 0.02
+
+# Wie lange der Pump-Thread blockierend auf die Queue wartet, bevor er
+# prüft, ob die App noch läuft
+EVENT_PUMP_TIMEOUT = 0.5
+
+# So viele Request-IDs merkt sich der Index Request-ID → Endpoint (älteste
+# fliegen zuerst raus; die Viewer halten ohnehin nur die letzten Hits)
+MAX_INDEXED_HITS = 10000
+
+# DB-Writes werden gepuffert und gebündelt geschrieben (ein Commit pro Batch):
+# spätestens alle PERSIST_INTERVAL Sekunden oder ab PERSIST_BATCH_SIZE Einträgen
+PERSIST_INTERVAL = 0.2
+PERSIST_BATCH_SIZE = 128
+
+# Stats-Dashboard wird höchstens so oft neu aufgebaut (Sekunden), egal wie viele Hits kommen
+STATS_REFRESH_INTERVAL = 0.1
+
+# So viele geleerte RequestViewer bleiben nach einem Session-Wechsel (versteckt)
+# gemountet und werden für denselben Endpoint wiederverwendet
+VIEWER_POOL_SIZE = 64
+
+# Methoden, die bei startup_routes nicht als Anzeige-Methode gewählt werden
+_SKIP_ROUTE_METHODS = frozenset(("HEAD", "OPTIONS"))
+
+# Request-Daten, die nur das Pending-Event bzw. der Abschluss der Middleware trägt
+_REQUEST_FIELDS = ("request_params", "request_body", "request_headers")
+
+
+def _fill_request_fields(hit: EndpointHit, data: Dict[str, Any]) -> List[str]:
+    """Trägt fehlende Request-Daten aus einem Abschluss am Hit nach."""
+    filled = []
+    for field in _REQUEST_FIELDS:
+        if getattr(hit, field) is None and data.get(field) is not None:
+            setattr(hit, field, data[field])
+            filled.append(field)
+    if hit.client == "unknown" and data.get("client", "unknown") != "unknown":
+        hit.client = data["client"]
+        filled.append("client")
+    return filled
+
+
 class FastAPITUI(App):
     """
     Haupt-TUI-Anwendung für FastAPI-Monitoring
@@ -142,12 +195,41 @@ class FastAPITUI(App):
     
     def __init__(self, event_queue: Optional[Queue] = None):
         super().__init__()
-        self.event_queue = event_queue or Queue()
+        self.event_queue = event_queue if event_queue is not None else SimpleQueue()
         self.endpoint_stats: Dict[str, EndpointStats] = {}
         self.endpoint_viewers: Dict[str, RequestViewer] = {}
         self.running = True
         self.start_time = datetime.now()
         self.config = get_config()
+        # Einmal auflösen statt pro Event den globalen Getter zu fragen
+        self.persistence = get_persistence()
+        # Vom Pump-Thread übernommene, noch nicht verarbeitete Events
+        self._incoming: SimpleQueue = SimpleQueue()
+        self._drain_scheduled = False
+        # Request-ID → Endpoint, damit Log-/Exception-Updates nicht alle Viewer durchsuchen
+        self._hit_endpoints: Dict[str, str] = {}
+        # IDs der noch laufenden Requests (active_connections ohne alle Hits zu scannen)
+        self._pending_ids: Set[str] = set()
+        # Write-Behind Puffer für die Persistenz (siehe _flush_persistence)
+        self._pending_hits: Deque[Dict[str, Any]] = deque()
+        self._pending_logs: Deque[Tuple[str, str, Any]] = deque()
+        # Seit dem letzten Dashboard-Update geänderte Endpoint-Stats (siehe _flush_stats)
+        self._dirty_stats: Dict[str, EndpointStats] = {}
+        # Endpoint → geleerter, versteckter Viewer (LRU, siehe _clear_ui_state)
+        self._viewer_pool: "OrderedDict[str, RequestViewer]" = OrderedDict()
+        # Event-Typ → Handler(event, save) für _handle_event
+        self._dispatch: Dict[str, Callable[[Dict[str, Any], bool], None]] = {
+            "hit": self._on_hit,
+            "custom": self._on_custom,
+            "stats_update": self._on_stats_update,
+            "log": self._on_log,
+            "log_batch": self._on_log_batch,
+            "batch": self._on_batch,
+            "startup_routes": self._on_startup_routes,
+            "request": self._on_request,
+            "runtime_log_update": self._on_runtime_log_update,
+            "exception": self._on_exception,
+        }
     
     def compose(self) -> ComposeResult:
         """Layout der App"""
@@ -182,41 +264,64 @@ class FastAPITUI(App):
     
     def on_mount(self) -> None:
         """App wurde gestartet"""
+        # Feste Widgets einmal auflösen: die Handler laufen pro Event und
+        # sollen nicht jedes Mal den DOM per Selector durchsuchen
+        self._endpoint_list = self.query_one("#endpoint-list", EndpointList)
+        self._server_logs = self.query_one("#server-logs", ServerLogsViewer)
+        self._exceptions_viewer = self.query_one("#exceptions-viewer", ExceptionViewer)
+        self._stats_dashboard = self.query_one("#stats-panel", StatsDashboard)
+        self._tabs = self.query_one("#tabs", TabbedContent)
+        self._viewer_container = self.query_one("#endpoint-viewer-container", Container)
+        
         # Initial Placeholder
-        self.query_one("#endpoint-viewer-container").mount(
+        self._viewer_container.mount(
             Static("Select an endpoint to view details", id="placeholder")
         )
 
         # UI Settings anwenden
         if not self.config.show_sidebar:
-            self.query_one("#endpoint-list", EndpointList).add_class("hidden")
+            self._endpoint_list.add_class("hidden")
             
         if not self.config.show_stats_panel:
-            self.query_one("#stats-panel", StatsDashboard).styles.display = "none"
+            self._stats_dashboard.styles.display = "none"
             self.config.enable_stats = False 
 
         # 1. Initiale Session setzen
-        persistence = get_persistence()
+        persistence = self.persistence
         self.viewing_session_id = persistence.current_session_id
 
         # 2. Lade Historie (für die aktuelle Session)
         self.load_history(self.viewing_session_id)
         
-        # 3. Starte Event-Processing
-        self.set_interval(0.1, self.process_events)
+        # 3. Starte Event-Processing: ein Thread wartet blockierend auf die
+        # (Manager-)Queue und weckt die App, statt sie alle 100ms zu pollen
+        threading.Thread(
+            target=self._pump_events,
+            args=(asyncio.get_running_loop(),),
+            name="tui-event-pump",
+            daemon=True
+        ).start()
+        
+        # 4. Gepufferte DB-Writes regelmäßig schreiben
+        self.set_interval(PERSIST_INTERVAL, self._flush_persistence)
         
-        # 4. Starte System-Stats Collection
+        # 5. Geänderte Endpoint-Stats gesammelt ans Dashboard geben
+        self.set_interval(STATS_REFRESH_INTERVAL, self._flush_stats)
+        
+        # 6. Starte System-Stats Collection
         if self.config.enable_stats:
             self.set_interval(2.0, self._collect_system_stats)
 
     def load_history(self, session_id: Optional[str] = None):
         """Lädt historische Daten aus der Persistenz"""
-        persistence = get_persistence()
+        # Gepufferte Writes zuerst schreiben, sonst fehlen sie beim Lesen
+        self._flush_persistence()
+        persistence = self.persistence
         target_session = session_id or persistence.current_session_id
         
         # 1. Logs laden
         logs = persistence.get_recent_logs(session_id=target_session)
-        server_logs = self.query_one("#server-logs", ServerLogsViewer)
+        server_logs = self._server_logs
         for log in logs:
             log_data = {
                 "timestamp": log.get("timestamp"),
@@ -226,154 +331,257 @@ class FastAPITUI(App):
             }
             server_logs.add_log(log_data)
             
-        # 2. Hits (Requests) laden
-        hits = persistence.get_recent_hits(session_id=target_session)
+        # 2. Hits (Requests) laden – älteste zuerst, in Chunks aus der DB gestreamt
         
         # Exception Viewer holen
-        exc_viewer = self.query_one("#exceptions-viewer", ExceptionViewer)
+        exc_viewer = self._exceptions_viewer
+        # Exceptions können doppelt vorkommen (Legacy-Feld + Liste) → nur einmal anzeigen
+        seen_exceptions = set()
+        
+        def add_exception(exc: Dict[str, Any]) -> None:
+            key = exc.get("id") if isinstance(exc, dict) else None
+            if key is not None:
+                if key in seen_exceptions:
+                    return
+                seen_exceptions.add(key)
+            exc_viewer.add_exception(exc)
         
-        for hit_data in reversed(hits): # Älteste zuerst
-            hit = EndpointHit(**hit_data)
+        for chunk in persistence.iter_recent_hits(session_id=target_session, raw=True):
+            # JSON direkt in pydantic-core validieren statt json.loads + Dict-Validierung
+            hits = [EndpointHit.model_validate_json(raw) for raw in chunk]
             
-            # A) Request verarbeiten (baut Endpoint Liste & Request Viewer auf)
-            self._handle_hit(hit, save=False)
+            # A) Requests verarbeiten (baut Endpoint Liste & Request Viewer auf),
+            # pro Chunk ein Update je Widget statt eines pro Hit
+            with self.batch_update():
+                self._handle_hits_bulk(hits)
             
             # B) Exceptions extrahieren und in den globalen Viewer laden
-            
-            # FIX: Wir prüfen das rohe Dict auf Legacy-Daten, da das Model kein 'exception' Feld hat
-            if "exception" in hit_data and hit_data["exception"]:
-                exc_viewer.add_exception(hit_data["exception"])
-            
-            # Standard Model-Feld (Liste)
-            if hit.exceptions:
+            for raw, hit in zip(chunk, hits):
+                # FIX: Wir prüfen die rohen Daten auf Legacy-Daten, da das Model kein 'exception' Feld hat
+                # (geparst wird nur, wenn der Key überhaupt im JSON vorkommt)
+                if '"exception"' in raw:
+                    legacy_exc = json.loads(raw).get("exception")
+                    if legacy_exc:
+                        add_exception(legacy_exc)
+                
+                # Standard Model-Feld (Liste)
                 for exc in hit.exceptions:
-                    exc_viewer.add_exception(exc)
+                    add_exception(exc)
+
+    def _pump_events(self, loop: asyncio.AbstractEventLoop) -> None:
+        """
+        Läuft im eigenen Thread: holt Events blockierend aus der Queue und
+        reicht sie an den Event-Loop der App weiter (kein Polling, keine
+        Manager-Roundtrips im UI-Thread).
+        """
+        while self.running:
+            try:
+                event = self.event_queue.get(timeout=EVENT_PUMP_TIMEOUT)
+            except Empty:
+                continue
+            except Exception:
+                # Queue/Manager weg (z.B. beim Beenden)
+                return
+            
+            self._incoming.put(event)
+            # Nur aufwecken, wenn nicht schon ein Durchlauf ansteht
+            if not self._drain_scheduled:
+                self._drain_scheduled = True
+                try:
+                    loop.call_soon_threadsafe(self.call_later, self.process_events)
+                except RuntimeError:
+                    # Loop bereits geschlossen
+                    return
 
     def process_events(self) -> None:
-        """Verarbeitet Events aus der Queue"""
-        persistence = get_persistence()
+        """Verarbeitet die vom Pump-Thread übernommenen Events"""
+        # Vor dem Leeren zurücksetzen: was ab jetzt reinkommt, weckt erneut
+        self._drain_scheduled = False
+        persistence = self.persistence
         
         # Prüfen ob wir LIVE sind
         is_live_view = (self.viewing_session_id == persistence.current_session_id)
         
-        try:
-            while not self.event_queue.empty():
-                event = self.event_queue.get_nowait()
-                
+        deadline = time.monotonic() + MAX_TICK_SECONDS
+        for _ in range(MAX_EVENTS_PER_TICK):
+            try:
+                event = self._incoming.get_nowait()
+            except Empty:
+                return
+            
+            try:
                 if is_live_view:
                     # Normaler Modus: Speichern und Anzeigen
                     self._handle_event(event, save=True)
                 else:
                     # History Modus: NUR Speichern (im Hintergrund), NICHT Anzeigen
                     self._save_event_only(event)
-                    
-        except Exception as e:
-            self.log(f"Error processing events: {e}")
+            except Exception as e:
+                self.log(f"Error processing events: {e}")
+            
+            if time.monotonic() >= deadline:
+                break
+        
+        # Limit erreicht, evtl. noch Events übrig: nach dem Repaint weitermachen
+        self.call_later(self.process_events)
     
+    def _save_hit(self, hit_data: Dict[str, Any]) -> None:
+        """Merkt einen Hit zum Speichern vor (geschrieben wird gebündelt)"""
+        self._pending_hits.append(hit_data)
+        if len(self._pending_hits) >= PERSIST_BATCH_SIZE:
+            self._flush_persistence()
+
+    def _save_log(self, level: str, message: str, timestamp: Any) -> None:
+        """Merkt ein Log zum Speichern vor (geschrieben wird gebündelt)"""
+        self._pending_logs.append((level, message, timestamp))
+        if len(self._pending_logs) >= PERSIST_BATCH_SIZE:
+            self._flush_persistence()
+
+    def _flush_persistence(self) -> None:
+        """Schreibt alle gepufferten Hits und Logs in einer gemeinsamen Transaktion"""
+        if not self._pending_hits and not self._pending_logs:
+            return
+        hits = list(self._pending_hits)
+        logs = list(self._pending_logs)
+        self._pending_hits.clear()
+        self._pending_logs.clear()
+        self.persistence.save_batch(hits, logs)
+
     def _save_event_only(self, event: Dict[str, Any]) -> None:
         """Speichert Events in die DB ohne UI-Update (für Background-Processing)"""
-        persistence = get_persistence()
         event_type = event.get("type")
         
         if event_type == "hit":
-            persistence.save_hit(event.get("data", {}))
+            self._save_hit(event.get("data", {}))
         elif event_type == "log":
             d = event.get("data", {})
-            persistence.save_log(d.get("level", "INFO"), d.get("message", ""), d.get("timestamp", datetime.now()))
+            self._save_log(d.get("level", "INFO"), d.get("message", ""), d.get("timestamp", datetime.now()))
+        elif event_type == "log_batch":
+            for d in self._expand_log_batch(event.get("data", {})):
+                self._save_log(d["level"], d["message"], d["timestamp"])
+        elif event_type == "batch":
+            for sub_event in event.get("data", []):
+                self._save_event_only(sub_event)
         elif event_type == "request":
             data = event.get("data", {})
-            # Legacy Request zu Hit Konvertierung für DB (vereinfacht)
-            hit = EndpointHit(
-                id=data.get("id") or str(uuid.uuid4()),
-                endpoint=data.get("endpoint"),
-                method=data.get("method"),
-                status_code=data.get("status_code"),
-                duration_ms=data.get("duration_ms"),
-                timestamp=data.get("timestamp") if isinstance(data.get("timestamp"), datetime) else datetime.now(),
-                client=data.get("client", "unknown"),
-                request_params=data.get("request_params"),
-                request_body=data.get("request_body"),
-                request_headers=data.get("request_headers"),
-                response_body=data.get("response_body"),
-                runtime_logs=data.get("runtime_logs", []),
-                pending=data.get("pending", False)
-            )
-            persistence.save_hit(hit.model_dump())
+            # Legacy Request zu Hit Konvertierung für DB (vereinfacht).
+            # Nichts wird angezeigt → Dict direkt im Format von EndpointHit.model_dump()
+            # bauen statt ein Model zu validieren und gleich wieder zu dumpen
+            endpoint = data.get("endpoint")
+            method = data.get("method")
+            if not isinstance(endpoint, str) or not isinstance(method, str):
+                return  # wäre kein gültiger EndpointHit (und beim Laden nicht lesbar)
+            timestamp = data.get("timestamp")
+            self._save_hit({
+                "id": data.get("id") or create_hit_id(),
+                "endpoint": endpoint,
+                "method": method,
+                "status_code": data.get("status_code"),
+                "duration_ms": data.get("duration_ms"),
+                "timestamp": timestamp if isinstance(timestamp, datetime) else datetime.now(),
+                "client": data.get("client", "unknown"),
+                "request_params": data.get("request_params"),
+                "request_body": data.get("request_body"),
+                "request_headers": data.get("request_headers"),
+                "response_body": data.get("response_body"),
+                "response_headers": None,
+                "runtime_logs": list(data.get("runtime_logs") or []),
+                "exceptions": [],
+                "pending": data.get("pending", False),
+                "error": None
+            })
 
     def _handle_event(self, event: Dict[str, Any], save: bool = True) -> None:
         """Verarbeitet ein einzelnes Event"""
-        persistence = get_persistence()
-        event_type = event.get("type")
-        
-        if event_type == "hit":
-            hit_data = event.get("data", {})
-            hit = EndpointHit(**hit_data)
-            if save: persistence.save_hit(hit_data)
-            self._handle_hit(hit, save=save)
-        
-        elif event_type == "custom":
-            event_data = event.get("data", {})
-            custom_event = CustomEvent(**event_data)
-            self._handle_custom_event(custom_event)
-        
-        elif event_type == "stats_update":
-            stats_data = event.get("data", {})
-            endpoint = stats_data.get("endpoint")
-            if endpoint:
-                stats = EndpointStats(**stats_data)
-                self._update_stats(endpoint, stats)
-        
-        elif event_type == "log":
-            log_data = event.get("data", {})
-            if save: 
-                persistence.save_log(
-                    log_data.get("level", "INFO"), 
-                    log_data.get("message", ""), 
-                    log_data.get("timestamp", datetime.now())
-                )
-            if "type" not in log_data:
-                log_data["type"] = log_data.get("level", "INFO")
-            self._handle_log(log_data)
-        
-        elif event_type == "startup_routes":
-            routes = event.get("data", [])
-            endpoint_list = self.query_one("#endpoint-list", EndpointList)
-            for route in routes:
-                path = route.get("path")
-                methods = route.get("methods", [])
-                method = next((m for m in methods if m not in ["HEAD", "OPTIONS"]), "GET")
-                if path:
-                    endpoint_list.add_endpoint(path, method)
-                    self.add_window(path)
-            
-        elif event_type == "request":
-            self._handle_legacy_request(event, save=save)
-        
-        elif event_type == "runtime_log_update":
-            self._handle_runtime_log_update(event.get("data", {}))
-        
-        elif event_type == "exception":
-            self._handle_exception_event(event.get("data", {}))
+        # Ein Dict-Lookup statt if/elif-Kette über alle Event-Typen
+        handler = self._dispatch.get(event.get("type"))
+        if handler is not None:
+            handler(event, save)
+
+    def _on_hit(self, event: Dict[str, Any], save: bool) -> None:
+        hit_data = event.get("data", {})
+        hit = EndpointHit(**hit_data)
+        if save: self._save_hit(hit_data)
+        self._handle_hit(hit, save=save)
+
+    def _on_custom(self, event: Dict[str, Any], save: bool) -> None:
+        custom_event = CustomEvent(**event.get("data", {}))
+        self._handle_custom_event(custom_event)
+
+    def _on_stats_update(self, event: Dict[str, Any], save: bool) -> None:
+        stats_data = event.get("data", {})
+        endpoint = stats_data.get("endpoint")
+        if endpoint:
+            stats = EndpointStats(**stats_data)
+            self._update_stats(endpoint, stats)
+
+    def _on_log(self, event: Dict[str, Any], save: bool) -> None:
+        log_data = event.get("data", {})
+        if save: 
+            self._save_log(
+                log_data.get("level", "INFO"), 
+                log_data.get("message", ""), 
+                log_data.get("timestamp", datetime.now())
+            )
+        if "type" not in log_data:
+            log_data["type"] = log_data.get("level", "INFO")
+        self._handle_log(log_data)
+
+    def _on_log_batch(self, event: Dict[str, Any], save: bool) -> None:
+        for log_data in self._expand_log_batch(event.get("data", {})):
+            self._on_log({"type": "log", "data": log_data}, save)
+
+    def _on_batch(self, event: Dict[str, Any], save: bool) -> None:
+        # Gebündelte Events eines Producers (siehe server_logger._QueueSender)
+        for sub_event in event.get("data", []):
+            self._handle_event(sub_event, save=save)
+
+    def _on_startup_routes(self, event: Dict[str, Any], save: bool) -> None:
+        routes = event.get("data", [])
+        pairs = []
+        for route in routes:
+            path = route.get("path")
+            methods = route.get("methods", [])
+            method = next((m for m in methods if m not in _SKIP_ROUTE_METHODS), "GET")
+            if path:
+                pairs.append((path, method))
+        # Bei hunderten Routen: Liste einmal neu aufbauen, Viewer mit einem
+        # Mount einhängen und Zwischen-Paints unterdrücken
+        with self.batch_update():
+            self._endpoint_list.add_endpoints_bulk(pairs)
+            self.add_windows([path for path, _ in pairs])
+
+    def _on_request(self, event: Dict[str, Any], save: bool) -> None:
+        self._handle_legacy_request(event, save=save)
+
+    def _on_runtime_log_update(self, event: Dict[str, Any], save: bool) -> None:
+        self._handle_runtime_log_update(event.get("data", {}))
+
+    def _on_exception(self, event: Dict[str, Any], save: bool) -> None:
+        self._handle_exception_event(event.get("data", {}))
+
+    def _expand_log_batch(self, batch: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Zerlegt ein gebündeltes "log_batch" Event in einzelne Log-Dicts"""
+        level = batch.get("level", "INFO")
+        timestamp = batch.get("timestamp", datetime.now())
+        return [
+            {"level": level, "message": message, "timestamp": timestamp, "type": level}
+            for message in batch.get("messages", [])
+        ]
 
     def _handle_legacy_request(self, req: Dict[str, Any], save: bool = True):
-        persistence = get_persistence()
         data = req.get("data", req)
         request_id = data.get("id")
         endpoint = data.get("endpoint")
         
-        existing_hit = None
-        if endpoint in self.endpoint_viewers:
-            viewer = self.endpoint_viewers[endpoint]
-            if hasattr(viewer, 'hits'): 
-                for hit in viewer.hits:
-                    if hit.id == request_id:
-                        existing_hit = hit
-                        break
+        # ID-Index im Viewer statt die Hit-Liste zu durchsuchen
+        viewer = self.endpoint_viewers.get(endpoint)
+        existing_hit = viewer.get_hit(request_id) if viewer is not None else None
         
         if data.get("pending") or (not data.get("completed")):
             if not existing_hit:
                 hit = EndpointHit(
-                    id=request_id or str(uuid.uuid4()),
+                    id=request_id or create_hit_id(),
                     endpoint=endpoint,
                     method=data.get("method"),
                     status_code=None,
@@ -386,7 +594,11 @@ class FastAPITUI(App):
                     runtime_logs=data.get("runtime_logs", []),
                     pending=True
                 )
-                if save: persistence.save_hit(hit.model_dump())
+                if save:
+                    # Dict am Hit merken: der Abschluss aktualisiert nur dieses
+                    # (vor _handle_hit, damit die Viewer-Kopie es mitbekommt)
+                    hit._saved = hit.model_dump()
+                    self._save_hit(hit._saved)
                 self._handle_hit(hit, save=save)
             
         elif data.get("completed"):
@@ -396,20 +608,39 @@ class FastAPITUI(App):
                 existing_hit.response_body = data.get("response_body")
                 existing_hit.runtime_logs = data.get("runtime_logs", [])
                 existing_hit.pending = False
+                self._pending_ids.discard(existing_hit.id)
+                # Wurde der Hit aus einem Abschluss ohne Request-Daten angelegt
+                # (Exception-Handler vor der Middleware), hier nachtragen
+                filled = _fill_request_fields(existing_hit, data)
                 
                 if data.get("exception"):
                     exc_data = data.get("exception")
-                    # FIX: Nur zur Liste hinzufügen, nicht als Attribut setzen
-                    existing_hit.exceptions = existing_hit.exceptions + [exc_data]
-                
-                if endpoint in self.endpoint_viewers:
-                    self.endpoint_viewers[endpoint].add_hit(existing_hit)
+                    # In-place anhängen statt Liste pro Exception neu zu kopieren
+                    existing_hit.exceptions.append(exc_data)
                 
                 if save: 
                     try:
-                        persistence.save_hit(existing_hit.model_dump())
+                        saved = existing_hit._saved
+                        if saved is None:
+                            saved = existing_hit.model_dump()
+                        else:
+                            # Nur die beim Abschluss geänderten Felder nachziehen
+                            saved["status_code"] = existing_hit.status_code
+                            saved["duration_ms"] = existing_hit.duration_ms
+                            saved["response_body"] = existing_hit.response_body
+                            saved["runtime_logs"] = existing_hit.runtime_logs
+                            saved["exceptions"] = existing_hit.exceptions
+                            saved["pending"] = False
+                            for field in filled:
+                                saved[field] = getattr(existing_hit, field)
+                        # Danach wird der Hit nicht mehr gespeichert → Dict freigeben
+                        existing_hit._saved = None
+                        self._save_hit(saved)
                     except Exception as e:
                         self.log(f"❌ DB Error saving hit: {e}")
+                
+                # existing_hit kommt aus diesem Viewer
+                viewer.add_hit(existing_hit)
 
                 if endpoint in self.endpoint_stats:
                     self.endpoint_stats[endpoint].update(existing_hit, count_hit=False)
@@ -421,7 +652,7 @@ class FastAPITUI(App):
 
             else:
                 hit = EndpointHit(
-                    id=request_id or str(uuid.uuid4()),
+                    id=request_id or create_hit_id(),
                     endpoint=endpoint,
                     method=data.get("method"),
                     status_code=data.get("status_code") or data.get("status"),
@@ -435,110 +666,189 @@ class FastAPITUI(App):
                     runtime_logs=data.get("runtime_logs", []),
                     pending=False
                 )
-                if save: persistence.save_hit(hit.model_dump())
+                if save: self._save_hit(hit.model_dump())
                 self._handle_hit(hit, save=save)
 
+    def _find_hit(self, request_id: str):
+        """Viewer und Hit zu einer Request-ID (oder (None, None))."""
+        viewer = self.endpoint_viewers.get(self._hit_endpoints.get(request_id))
+        if viewer is not None:
+            hit = viewer.get_hit(request_id)
+            if hit is not None:
+                return viewer, hit
+        return None, None
+
     def _handle_runtime_log_update(self, data: Dict[str, Any]) -> None:
         request_id = data.get("request_id")
         all_logs = data.get("all_logs", [])
         if not request_id: return
-        for endpoint, viewer in self.endpoint_viewers.items():
-            if hasattr(viewer, 'hits'):
-                for hit in viewer.hits:
-                    if hit.id == request_id:
-                        hit.runtime_logs = all_logs
-                        viewer.add_hit(hit)
-                        return
+        viewer, hit = self._find_hit(request_id)
+        if hit is not None:
+            hit.runtime_logs = all_logs
+            viewer.add_hit(hit)
 
     def _handle_exception_event(self, data: Dict[str, Any]) -> None:
         try:
-            exceptions_viewer = self.query_one("#exceptions-viewer", ExceptionViewer)
+            exceptions_viewer = self._exceptions_viewer
             exceptions_viewer.add_exception(data)
         except Exception: pass
         
         request_id = data.get("request_id")
         if request_id:
-            for endpoint, viewer in self.endpoint_viewers.items():
-                if hasattr(viewer, 'hits'):
-                    for hit in viewer.hits:
-                        if hit.id == request_id:
-                            # FIX: Nur zur Liste hinzufügen
-                            hit.exceptions = hit.exceptions + [data]
-                            viewer.add_hit(hit)
-                            try:
-                                inspector = viewer.query_one("RequestInspector")
-                                if inspector.hit and inspector.hit.id == request_id:
-                                    inspector.force_refresh_data(hit)
-                            except: pass
-                            return
+            viewer, hit = self._find_hit(request_id)
+            if hit is not None:
+                # In-place anhängen (keine Kopie der Liste pro Exception);
+                # add_hit ersetzt den Eintrag trotzdem und triggert das Update
+                hit.exceptions.append(data)
+                viewer.add_hit(hit)
+                try:
+                    inspector = viewer.query_one("RequestInspector")
+                    if inspector.hit and inspector.hit.id == request_id:
+                        inspector.force_refresh_data(hit)
+                except: pass
 
     def _handle_log(self, log_data: Dict[str, Any]) -> None:
-        server_logs = self.query_one("#server-logs", ServerLogsViewer)
+        server_logs = self._server_logs
         server_logs.add_log(log_data)
     
     def _handle_hit(self, hit: EndpointHit, save: bool = True) -> None:
-        endpoint_list = self.query_one("#endpoint-list", EndpointList)
+        endpoint_list = self._endpoint_list
         endpoint_list.add_endpoint(hit.endpoint, hit.method)
         
-        if hit.endpoint not in self.endpoint_viewers:
+        viewer = self.endpoint_viewers.get(hit.endpoint)
+        if viewer is None:
             self.add_window(hit.endpoint)
-        
-        if hit.endpoint in self.endpoint_viewers:
             viewer = self.endpoint_viewers[hit.endpoint]
-            viewer.add_hit(hit)
+        self._forget_hits(viewer.add_hit(hit))
+        self._track_hit(hit)
+
+    def _handle_hits_bulk(self, hits: List[EndpointHit]) -> None:
+        """Wie _handle_hit für viele Hits (älteste zuerst), mit einem Update pro Widget."""
+        if not hits:
+            return
+        self._endpoint_list.add_endpoints_bulk([(hit.endpoint, hit.method) for hit in hits])
+        
+        by_endpoint: Dict[str, List[EndpointHit]] = {}
+        for hit in hits:
+            by_endpoint.setdefault(hit.endpoint, []).append(hit)
+        self.add_windows(list(by_endpoint))
+        
+        # Erst indexieren, dann Verdrängte austragen (auch aus diesem Chunk)
+        for hit in hits:
+            self._track_hit(hit)
+        for endpoint, endpoint_hits in by_endpoint.items():
+            self._forget_hits(self.endpoint_viewers[endpoint].extend_hits(endpoint_hits))
+
+    def _forget_hits(self, evicted: List[str]) -> None:
+        # Aus dem Viewer verdrängte Hits sind nicht mehr auffindbar/aktiv
+        hit_endpoints = self._hit_endpoints
+        for evicted_id in evicted:
+            hit_endpoints.pop(evicted_id, None)
+            self._pending_ids.discard(evicted_id)
+
+    def _track_hit(self, hit: EndpointHit) -> None:
+        """Index, aktive Requests und Stats für einen angezeigten Hit nachziehen."""
+        hit_endpoints = self._hit_endpoints
+        if hit.id not in hit_endpoints:
+            if len(hit_endpoints) >= MAX_INDEXED_HITS:
+                # Dicts sind nach Einfügen sortiert → ältesten Eintrag verwerfen
+                # (nie abgeschlossene Requests zählen dann auch nicht mehr als aktiv)
+                oldest = next(iter(hit_endpoints))
+                del hit_endpoints[oldest]
+                self._pending_ids.discard(oldest)
+            hit_endpoints[hit.id] = hit.endpoint
+        
+        if hit.pending:
+            self._pending_ids.add(hit.id)
+        else:
+            self._pending_ids.discard(hit.id)
         
-        if hit.endpoint not in self.endpoint_stats:
-            self.endpoint_stats[hit.endpoint] = EndpointStats(endpoint=hit.endpoint)
+        stats = self.endpoint_stats.get(hit.endpoint)
+        if stats is None:
+            stats = self.endpoint_stats[hit.endpoint] = EndpointStats(endpoint=hit.endpoint)
         
-        self.endpoint_stats[hit.endpoint].update(hit)
-        self._update_stats(hit.endpoint, self.endpoint_stats[hit.endpoint])
+        stats.update(hit)
+        self._update_stats(hit.endpoint, stats)
     
     def _handle_custom_event(self, event: CustomEvent) -> None:
-        endpoint_list = self.query_one("#endpoint-list", EndpointList)
+        endpoint_list = self._endpoint_list
         if event.endpoint not in endpoint_list.endpoints:
             endpoint_list.add_endpoint(event.endpoint, "CUSTOM")
         
-        if event.endpoint not in self.endpoint_viewers:
+        viewer = self.endpoint_viewers.get(event.endpoint)
+        if viewer is None:
             self.add_window(event.endpoint)
-        
-        if event.endpoint in self.endpoint_viewers:
             viewer = self.endpoint_viewers[event.endpoint]
-            viewer.add_event(event)
+        viewer.add_event(event)
     
     def _update_stats(self, endpoint: str, stats: EndpointStats) -> None:
-        stats_dashboard = self.query_one("#stats-panel", StatsDashboard)
-        stats_dashboard.update_stats(endpoint, stats)
+        # Nur vormerken: das Dashboard baut bei jedem Update die ganze Tabelle neu
+        self._dirty_stats[endpoint] = stats
+    
+    def _flush_stats(self) -> None:
+        """Gibt alle seit dem letzten Aufruf geänderten Stats in EINEM Update weiter"""
+        if not self._dirty_stats:
+            return
+        dirty = self._dirty_stats
+        self._dirty_stats = {}
+        self._stats_dashboard.update_stats_bulk(dirty)
     
+    def _take_viewer(self, endpoint: str) -> Tuple[RequestViewer, bool]:
+        """Viewer aus dem Pool holen oder neu erstellen. Liefert (viewer, muss_gemountet_werden)."""
+        viewer = self._viewer_pool.pop(endpoint, None)
+        if viewer is not None:
+            # Ist noch (versteckt) gemountet und wurde beim Einlagern geleert
+            return viewer, False
+        viewer = RequestViewer(endpoint, max_hits=self.config.max_hits_display)
+        viewer.display = False
+        return viewer, True
+
     def add_window(self, endpoint: str) -> None:
         if endpoint in self.endpoint_viewers:
             return
-        viewer = RequestViewer(endpoint)
-        viewer.display = False
+        viewer, is_new = self._take_viewer(endpoint)
         self.endpoint_viewers[endpoint] = viewer
-        container = self.query_one("#endpoint-viewer-container", Container)
-        container.mount(viewer)
-    
-    def _collect_system_stats(self) -> None:
-        cpu = 0.0
-        mem_percent = 0.0
-        mem_used = 0.0
-        mem_total = 0.0
-        if psutil:
-            try:
-                cpu = psutil.cpu_percent()
-                mem = psutil.virtual_memory()
-                mem_percent = mem.percent
-                mem_used = mem.used / (1024 * 1024)
-                mem_total = mem.total / (1024 * 1024)
-            except Exception: pass
+        if is_new:
+            self._viewer_container.mount(viewer)
+
+    def add_windows(self, endpoints: List[str]) -> None:
+        """Wie add_window für mehrere Endpoints, mit EINEM Mount für alle neuen Viewer."""
+        viewers = []
+        for endpoint in endpoints:
+            if endpoint in self.endpoint_viewers:
+                continue
+            viewer, is_new = self._take_viewer(endpoint)
+            self.endpoint_viewers[endpoint] = viewer
+            if is_new:
+                viewers.append(viewer)
+        if viewers:
+            self._viewer_container.mount_all(viewers)
+
+    @staticmethod
+    def _read_psutil() -> Tuple[float, float, int, int]:
+        """(cpu, mem_percent, mem_used_mb, mem_total_mb) – liest /proc, läuft im Executor."""
+        if not psutil:
+            return 0.0, 0.0, 0, 0
+        try:
+            cpu = psutil.cpu_percent()
+            mem = psutil.virtual_memory()
+            # Bytes → ganze MB per Shift (psutil liefert ints)
+            return cpu, mem.percent, mem.used >> 20, mem.total >> 20
+        except Exception:
+            return 0.0, 0.0, 0, 0
+
+    async def _collect_system_stats(self) -> None:
+        # Dashboard nicht sichtbar → keine /proc-Reads; beim Wechsel auf den
+        # Statistics-Tab wird sofort nachgeholt (on_tabbed_content_tab_activated)
+        if self._tabs.active != "stats-tab" or not self._stats_dashboard.display:
+            return
+        # psutil kann unter Last blockieren → nicht auf dem Textual-Loop lesen
+        cpu, mem_percent, mem_used, mem_total = await asyncio.get_running_loop().run_in_executor(
+            None, self._read_psutil
+        )
         
         uptime = (datetime.now() - self.start_time).total_seconds()
-        active_connections = sum(
-            1 for viewer in self.endpoint_viewers.values() 
-            if hasattr(viewer, 'hits') 
-            for hit in viewer.hits 
-            if hit.pending
-        )
+        active_connections = len(self._pending_ids)
         stats = SystemStats(
             cpu_percent=cpu,
             memory_percent=mem_percent,
@@ -548,19 +858,25 @@ class FastAPITUI(App):
             uptime_seconds=uptime
         )
         try:
-            dashboard = self.query_one("#stats-panel", StatsDashboard)
+            dashboard = self._stats_dashboard
             dashboard.update_system_stats(stats)
         except Exception: pass
 
     def on_endpoint_list_endpoint_selected(self, message: EndpointList.EndpointSelected) -> None:
         self.current_endpoint = message.endpoint
-        self.query_one("#tabs", TabbedContent).active = "endpoints-tab"
+        self._tabs.active = "endpoints-tab"
         for endpoint, viewer in self.endpoint_viewers.items():
             if endpoint == message.endpoint:
                 viewer.display = True
             else:
                 viewer.display = False
     
+    def on_tabbed_content_tab_activated(self, message: TabbedContent.TabActivated) -> None:
+        # System-Stats werden nur bei sichtbarem Dashboard gesammelt → beim
+        # Öffnen des Tabs direkt aktualisieren statt bis zu 2s alte Werte zu zeigen
+        if message.pane.id == "stats-tab" and self.config.enable_stats:
+            self.run_worker(self._collect_system_stats(), exclusive=True, group="system-stats")
+
     def on_session_manager_session_selected(self, message: SessionManager.SessionSelected) -> None:
         """Handler wenn Session ausgewählt wurde"""
         new_session_id = message.session_id
@@ -570,7 +886,7 @@ class FastAPITUI(App):
             return
             
         self.viewing_session_id = new_session_id
-        persistence = get_persistence()
+        persistence = self.persistence
         is_live = (new_session_id == persistence.current_session_id)
         
         status_msg = "LIVE Session" if is_live else "HISTORICAL Session"
@@ -585,40 +901,50 @@ class FastAPITUI(App):
     def _clear_ui_state(self) -> None:
         """Setzt die gesamte UI zurück."""
         # 1. Endpoint List leeren
-        self.query_one("#endpoint-list", EndpointList).clear()
+        self._endpoint_list.clear()
         
         # 2. Logs leeren
         try:
-            self.query_one("#server-logs", ServerLogsViewer).clear()
+            self._server_logs.clear()
         except: pass
         
         # 3. Stats leeren
-        self.query_one("#stats-panel", StatsDashboard).clear()
+        self._stats_dashboard.clear()
 
         # 4. Exceptions leeren
         try:
-            self.query_one("#exceptions-viewer", ExceptionViewer).clear()
+            self._exceptions_viewer.clear()
         except: pass
         
-        # 5. Request Viewers entfernen (SICHERE METHODE)
-        container = self.query_one("#endpoint-viewer-container", Container)
-        
-        # Wir entfernen alle Kinder, die NICHT der Placeholder sind
-        for child in list(container.children):
-            if child.id != "placeholder":
-                child.remove()
+        # 5. Request Viewers geleert in den Pool legen statt zu entfernen:
+        # beim nächsten Laden werden sie für denselben Endpoint wiederverwendet
+        container = self._viewer_container
+        pool = self._viewer_pool
+        for endpoint, viewer in self.endpoint_viewers.items():
+            viewer.clear()
+            viewer.display = False
+            pool[endpoint] = viewer
+            pool.move_to_end(endpoint)
         
+        # Älteste Viewer über dem Limit wirklich entfernen
+        while len(pool) > VIEWER_POOL_SIZE:
+            _, evicted = pool.popitem(last=False)
+            evicted.remove()
+
         # Falls der Placeholder aus irgendeinem Grund weg ist, neu erstellen
         if not container.query("#placeholder"):
              container.mount(Static("Select an endpoint to view details", id="placeholder"))
         
         self.endpoint_viewers = {}
+        self._hit_endpoints = {}
+        self._pending_ids = set()
         
         # 6. Interne Stats resetten
         self.endpoint_stats = {}
+        self._dirty_stats = {}
 
     def action_toggle_sidebar(self) -> None:
-        sidebar = self.query_one("#endpoint-list", EndpointList)
+        sidebar = self._endpoint_list
         if sidebar.has_class("hidden"):
             sidebar.remove_class("hidden")
         else:
@@ -629,7 +955,13 @@ class FastAPITUI(App):
     
     def action_quit(self) -> None:
         self.running = False
+        self._flush_persistence()
         self.exit()
+    
+    def on_unmount(self) -> None:
+        # Pump-Thread beenden (auch wenn die App nicht über action_quit endet)
+        self.running = False
+        self._flush_persistence()
 
 
 class TUIManager:
@@ -646,7 +978,9 @@ class TUIManager:
     """
     
     def __init__(self):
-        self.event_queue = Queue()
+        # SimpleQueue: put/get in C ohne Python-Lock/Condition wie bei Queue,
+        # der Pump-Thread der App blockiert trotzdem per get(timeout=...)
+        self.event_queue = SimpleQueue()
         self.tui_thread: Optional[threading.Thread] = None
         self.tui_app: Optional[FastAPITUI] = None
         self.started = False
@@ -685,7 +1019,7 @@ class TUIManager:
     ) -> None:
         """Loggt einen Endpoint-Hit"""
         hit = EndpointHit(
-            id=str(uuid.uuid4()),
+            id=create_hit_id(),
             endpoint=endpoint,
             method=method,
             status_code=status_code,
@@ -713,15 +1047,15 @@ class TUIManager:
             self.start()
         
         event = CustomEvent(
-            id=str(uuid.uuid4()),
+            id=create_hit_id(),
             endpoint=endpoint,
             message=message,
             data=data,
             level=level
         )
         
-        # DEBUG: Print to verify event is being sent
-        print(f"[TUI] Logging event: {endpoint} - {message}")
+        # Debug-Ausgabe nur über logging (kein print + stdout-Lock pro Event)
+        logger.debug("[TUI] Logging event: %s - %s", endpoint, message)
         
         self.event_queue.put({
             "type": "custom",
@@ -762,8 +1096,8 @@ def get_tui_manager() -> TUIManager:
     """Gibt die globale TUI-Manager-Instanz zurück"""
     global _tui_manager
     if _tui_manager is None:
-        print("[TUI] Creating new TUIManager instance")
+        logger.debug("[TUI] Creating new TUIManager instance")
         _tui_manager = TUIManager()
     else:
-        print(f"[TUI] Reusing existing TUIManager instance (queue size: {_tui_manager.event_queue.qsize()})")
+        logger.debug("[TUI] Reusing existing TUIManager instance")
     return _tui_manager
\ No newline at end of file
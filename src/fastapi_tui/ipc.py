@@ -1,14 +1,21 @@
 # app/utils/tui/ipc.py
 from multiprocessing.managers import BaseManager
-from multiprocessing import Queue
+from queue import Queue
 import os
 
 class TUIQueueManager(BaseManager):
     pass
 
-_queue = Queue()
+# Die Queue lebt ausschließlich im Manager-Server-Prozess; Runner, TUI und
+# FastAPI greifen nur über Proxies darauf zu. Eine multiprocessing.Queue
+# (Feeder-Thread, Pipe, zusätzliches Pickling) wäre hier reiner Overhead –
+# eine thread-sichere queue.Queue reicht. Sie wird erst im Server angelegt.
+_queue = None
 
 def get_queue():
+    global _queue
+    if _queue is None:
+        _queue = Queue()
     return _queue
 
 TUIQueueManager.register('get_queue', callable=get_queue)
@@ -26,6 +33,10 @@ def start_manager_server():
     
     return manager
 
+def is_tui_ipc_configured() -> bool:
+    """Günstiger Check (ohne Verbindung), ob wir unter dem TUI Runner laufen"""
+    return bool(os.environ.get('TUI_IPC_PORT') and os.environ.get('TUI_IPC_AUTHKEY'))
+
 def get_queue_client():
     """Client Verbindung für FastAPI"""
     port = os.environ.get('TUI_IPC_PORT')
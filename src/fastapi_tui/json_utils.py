@@ -0,0 +1,25 @@
+"""
+JSON helpers that use orjson when it is installed and fall back to the stdlib.
+"""
+
+import json
+from typing import Any, Callable, Optional, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def json_dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> str:
+    """Serialize to a JSON string (orjson if available)."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=default).decode()
+    return json.dumps(obj, default=default)
+
+
+def json_loads(data: Union[str, bytes]) -> Any:
+    """Parse JSON from str or bytes (bytes are passed through without decoding)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
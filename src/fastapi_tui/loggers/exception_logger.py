@@ -12,6 +12,14 @@ from queue import Queue
 
 from .runtime_logger import log_queue_ctx, request_id_ctx
 from ..config import get_config
+from ..core.events import create_hit_id
+
+
+# Detail-Text für Clients, wenn Exceptions nicht angezeigt werden (Production)
+_GENERIC_ERROR_DETAIL = "An internal error occurred. Please try again later."
+
+# Platzhalter für traceback_str, wenn der Fast Path nichts formatiert hat
+_TRACEBACK_NOT_CAPTURED = "Traceback not captured (TUI disabled)"
 
 
 class StackFrame(BaseModel):
@@ -21,7 +29,8 @@ class StackFrame(BaseModel):
     locals_preview: Dict[str, str] = Field(default_factory=dict)
 
 class ExceptionInfo(BaseModel):
-    id: str = Field(default_factory=lambda: str(__import__('uuid').uuid4()))
+    # Gleicher günstiger ID-Generator wie für Hits (kein os.urandom pro Exception)
+    id: str = Field(default_factory=create_hit_id)
     exception_type: str
     message: str
     traceback_str: str
@@ -58,7 +67,7 @@ def _extract_locals(frame_locals: Dict[str, Any], max_vars: int = 10) -> Dict[st
         if name.startswith('_'):
             continue
         
-        if name.lower() in config.mask_body_fields:
+        if config.should_mask_field(name):
             result[name] = "***MASKED***"
         else:
             result[name] = _safe_repr(value)
@@ -71,11 +80,15 @@ def capture_exception(
     exc: Exception,
     endpoint: Optional[str] = None,
     method: Optional[str] = None,
-    log_queue: Optional[Queue] = None
+    log_queue: Optional[Queue] = None,
+    send_to_tui: bool = True
 ) -> ExceptionInfo:
     """
     Captures an exception.
     
+    send_to_tui=False: das "exception" Event wird nicht sofort gesendet, der
+    Aufrufer schickt es selbst (z.B. zusammen mit dem Request-Abschluss).
+    
     PERFORMANCE NOTE:
     In Production (when log_queue is None), this function skips 
     expensive stack trace analysis and variable extraction.
@@ -105,7 +118,7 @@ def capture_exception(
         return ExceptionInfo(
             exception_type=type(exc).__name__,
             message=str(exc),
-            traceback_str="Traceback not captured (TUI disabled)", 
+            traceback_str=_TRACEBACK_NOT_CAPTURED,
             frames=[], # Leere Liste = Keine Performance Kosten
             request_id=request_id,
             endpoint=endpoint,
@@ -142,6 +155,9 @@ def capture_exception(
         method=method
     )
     
+    if not send_to_tui:
+        return exc_info
+    
     # An TUI senden
     try:
         queue.put_nowait({
@@ -159,4 +175,4 @@ def get_error_response_detail(exc: Exception) -> str:
     # Wenn Exceptions aktiviert sind (Dev Mode), zeigen wir Details
     if config.enable_exceptions:
         return str(exc)
-    return "An internal error occurred. Please try again later."
\ No newline at end of file
+    return _GENERIC_ERROR_DETAIL
\ No newline at end of file
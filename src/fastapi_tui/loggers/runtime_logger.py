@@ -3,7 +3,8 @@ from typing import List, Any, Optional
 from queue import Queue
 from ..config import get_config
 
-# ContextVars mit Defaults
+# ContextVars mit Defaults (auf Modulebene, einmal pro Prozess angelegt).
+# Dank der Defaults wirft .get() nie LookupError – Aufrufer brauchen kein try.
 runtime_logs_ctx = contextvars.ContextVar("runtime_logs", default=[])
 request_id_ctx = contextvars.ContextVar("request_id", default=None)
 log_queue_ctx = contextvars.ContextVar("log_queue", default=None)
@@ -52,11 +53,8 @@ def add_runtime_log(log: Any):
                 "all_logs": list(logs)
             }
         })
-    except (LookupError, Exception):
+    except Exception:
         pass
 
 def get_runtime_logs() -> List[Any]:
-    try:
-        return runtime_logs_ctx.get()
-    except LookupError:
-        return []
\ No newline at end of file
+    return runtime_logs_ctx.get()
@@ -1,32 +1,294 @@
 # app/utils/tui/loggers/server_logger.py
+import sys
+import atexit
+import threading
+import time
 from datetime import datetime
 from multiprocessing import Queue
+from queue import SimpleQueue, Empty
+from typing import Any, Dict, List, Optional
+
+# Maximale Anzahl Events, die der Sender in EINEM Queue-Put bündelt
+MAX_SEND_BATCH = 256
+
+# Obergrenze für lokal gepufferte, noch nicht gesendete Events. Hängt die TUI
+# (oder die IPC-Verbindung), werden neue Events verworfen statt den Server-
+# Prozess volllaufen zu lassen; die Anzahl wird später als ein Log gemeldet.
+MAX_PENDING_EVENTS = 10000
+
+# Wie lange der Sender nach dem ersten Event auf weitere wartet (Sekunden).
+# Bündelt Event-Stürme (z.B. viele Exceptions) in wenige Puts, kostet max. so viel Latenz.
+SEND_LINGER = 0.005
+
+
+class _QueueSender:
+    """
+    Entkoppelt Log-Producer von der (Manager-)Queue.
+    
+    Ein Put auf den Manager-Proxy ist ein blockierender Socket-Roundtrip.
+    Producer legen Events daher nur in eine lokale SimpleQueue; ein
+    Hintergrund-Thread leert sie und schickt alles, was sich angesammelt
+    hat, als EIN "batch" Event an die TUI.
+    """
+
+    def __init__(self, queue: Queue):
+        self.queue = queue
+        self._pending: SimpleQueue = SimpleQueue()
+        self._outstanding = 0  # gepuffert, aber noch nicht gesendet
+        self._dropped = 0      # seit der letzten Meldung verworfen
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="tui-log-sender", daemon=True)
+        self._thread.start()
+        atexit.register(self.drain)
+
+    def put(self, event: Dict[str, Any], block: bool = True, timeout: float = None) -> None:
+        self.put_nowait(event)
+
+    def put_nowait(self, event: Dict[str, Any]) -> None:
+        # Queue-kompatibel: Middleware & Logger können den Sender wie die Queue nutzen.
+        # Wirft nie (auch nicht bei vollem Puffer) – Aufrufer sitzen u.a. in Exception-Handlern.
+        with self._lock:
+            if self._outstanding >= MAX_PENDING_EVENTS:
+                self._dropped += 1
+                return
+            self._outstanding += 1
+        self._pending.put(event)
+
+    def _collect(self, first: Dict[str, Any], linger: float = 0.0) -> List[Dict[str, Any]]:
+        events = [first]
+        deadline = None
+        while len(events) < MAX_SEND_BATCH:
+            try:
+                events.append(self._pending.get_nowait())
+            except Empty:
+                if linger <= 0:
+                    break
+                if deadline is None:
+                    deadline = time.monotonic() + linger
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    events.append(self._pending.get(timeout=remaining))
+                except Empty:
+                    break
+        with self._lock:
+            self._outstanding -= len(events)
+        return events
+
+    def _send(self, events: List[Dict[str, Any]]) -> None:
+        events = _coalesce_requests(events)
+        with self._lock:
+            dropped, self._dropped = self._dropped, 0
+        if dropped:
+            events.append(_dropped_notice(dropped))
+        try:
+            if len(events) == 1:
+                self.queue.put_nowait(events[0])
+            else:
+                self.queue.put_nowait({"type": "batch", "data": events})
+        except Exception:
+            # Falls Queue voll ist oder Fehler auftritt: mitzählen, später melden
+            with self._lock:
+                self._dropped += len(events) - (1 if dropped else 0) + dropped
+
+    def _run(self) -> None:
+        while True:
+            self._send(self._collect(self._pending.get(), SEND_LINGER))
+
+    def drain(self) -> None:
+        """Schickt alles Ausstehende synchron (beim Prozess-Ende)."""
+        while True:
+            try:
+                first = self._pending.get_nowait()
+            except Empty:
+                return
+            self._send(self._collect(first))
+
+
+def _request_refs(event: Dict[str, Any]) -> List[Any]:
+    """Request-IDs, auf die sich ein (Nicht-Request-)Event bezieht."""
+    data = event.get("data")
+    if event.get("type") == "batch":
+        refs = []
+        for sub_event in data or ():
+            sub_data = sub_event.get("data")
+            if isinstance(sub_data, dict):
+                refs.append(sub_data.get("id") if sub_event.get("type") == "request" else sub_data.get("request_id"))
+        return refs
+    if isinstance(data, dict):
+        return [data.get("request_id")]
+    return []
+
+
+def _coalesce_requests(events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Lässt "pending" Request-Events weg, deren Abschluss im selben Batch folgt:
+    die TUI legt den Hit dann direkt aus dem Abschluss an (ein Event statt
+    zwei). Bezieht sich dazwischen ein anderes Event auf den Request
+    (Runtime-Log, Exception), bleibt das Pending-Event stehen, damit es dort
+    schon einen Hit gibt. Das gilt auch für einen Abschluss ohne Request-Daten
+    (z.B. aus send_exception_to_tui): nur der Abschluss der Middleware trägt
+    Body, Header und Client.
+    """
+    pending_at: Dict[Any, int] = {}
+    drop = []
+    for i, event in enumerate(events):
+        data = event.get("data")
+        if event.get("type") == "request" and isinstance(data, dict):
+            request_id = data.get("id")
+            if data.get("pending"):
+                pending_at[request_id] = i
+            elif data.get("completed") and request_id in pending_at:
+                if "request_body" in data:
+                    drop.append(pending_at.pop(request_id))
+                else:
+                    pending_at.pop(request_id)
+        elif pending_at:
+            for request_id in _request_refs(event):
+                pending_at.pop(request_id, None)
+    if not drop:
+        return events
+    dropped = set(drop)
+    return [event for i, event in enumerate(events) if i not in dropped]
+
+
+def _dropped_notice(count: int) -> Dict[str, Any]:
+    return {
+        "type": "log",
+        "data": {
+            "level": "WARNING",
+            "message": f"[TUI] Dropped {count} events (TUI queue backlog)",
+            "timestamp": datetime.now()
+        }
+    }
+
 
 # Globale Variable, die die Queue hält
 _log_queue: Queue = None
+_sender: _QueueSender = None
 
 def init_logger(queue: Queue):
     """Wird beim Start von run_fastapi aufgerufen, um die Queue zu speichern."""
-    global _log_queue
+    global _log_queue, _sender
+    if _log_queue is queue:
+        # Schon initialisiert (z.B. run_fastapi_process + setup_tui_logging)
+        return
     _log_queue = queue
+    _sender = _QueueSender(queue) if queue is not None else None
+
+def get_sender() -> Optional[_QueueSender]:
+    """
+    Queue-kompatibler Sender des aktuellen Prozesses (None ohne init_logger).
+    Puts landen lokal und gehen in Reihenfolge über den Sender-Thread raus.
+    """
+    return _sender
 
-def write_server_log(message: str, level: str = "INFO"):
+def write_server_log(
+    message: str,
+    level: str = "INFO",
+    log_type: Optional[str] = None,
+    timestamp: Optional[datetime] = None
+):
     """
     Diese Funktion sendet die Nachricht sicher an das TUI Log Window.
+    Gesendet wird über den Hintergrund-Sender (gebündelt, nicht blockierend).
+    Ist der Zeitpunkt schon bekannt (z.B. LogRecord.created), wird er übernommen.
     """
-    if _log_queue is not None:
-        try:
-            _log_queue.put_nowait({
-                "type": "log",
-                "data": {
-                    "level": level,
-                    "message": str(message),
-                    "timestamp": datetime.now()
-                }
-            })
-        except Exception as e:
-            # Falls Queue voll ist oder Fehler auftritt
-            pass
+    if _sender is not None:
+        data = {
+            "level": level,
+            "message": str(message),
+            "timestamp": timestamp or datetime.now()
+        }
+        if log_type:
+            data["type"] = log_type
+        _sender.put({"type": "log", "data": data})
     else:
         # Fallback
         print(f"[FALLBACK LOG] {level}: {message}")
+
+def write_server_log_batch(messages: List[str], level: str = "INFO"):
+    """
+    Sendet mehrere Log-Zeilen mit EINEM Queue-Put an die TUI.
+    Die TUI expandiert das "log_batch" Event wieder in einzelne Logs.
+    """
+    if not messages:
+        return
+    if _sender is not None:
+        _sender.put({
+            "type": "log_batch",
+            "data": {
+                "level": level,
+                "messages": messages,
+                "timestamp": datetime.now()
+            }
+        })
+    else:
+        # Fallback direkt auf das echte stdout (sys.stdout ist evtl. ein BridgeLogger)
+        for message in messages:
+            print(f"[FALLBACK LOG] {level}: {message}", file=sys.__stdout__)
+
+
+class BridgeLogger:
+    """
+    Ersatz für sys.stdout/sys.stderr, der Writes puffert und gebündelt
+    an die TUI schickt (alle `flush_interval` Sekunden oder ab `max_buffer` Zeichen).
+    """
+
+    def __init__(self, level: str = "PRINT", flush_interval: float = 0.05, max_buffer: int = 4096):
+        self.level = level
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self._lines: List[str] = []
+        self._partial = ""  # angefangene Zeile ohne "\n"
+        self._size = 0
+        self._lock = threading.Lock()
+        self._timer: threading.Timer = None
+        atexit.register(self.flush)
+
+    def write(self, msg):
+        try:
+            # Fast Path: print() schreibt das "\n" separat – ohne offene Zeile nichts zu tun
+            if not msg or (msg == "\n" and not self._partial):
+                return
+            with self._lock:
+                text = self._partial + msg if self._partial else msg
+                if "\n" in text:
+                    # Komplette Zeilen übernehmen, Rest bleibt als offene Zeile stehen
+                    *complete, self._partial = text.split("\n")
+                    for line in complete:
+                        if line and not line.isspace():
+                            line = line.strip()
+                            self._lines.append(line)
+                            self._size += len(line)
+                else:
+                    self._partial = text
+                
+                flush_now = self._size + len(self._partial) >= self.max_buffer
+                if not flush_now and self._timer is None:
+                    self._timer = threading.Timer(self.flush_interval, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+            if flush_now:
+                self.flush()
+        except Exception:
+            pass
+
+    def flush(self):
+        with self._lock:
+            lines = self._lines
+            # Offene Zeile spätestens nach flush_interval mitschicken
+            if self._partial and not self._partial.isspace():
+                lines.append(self._partial.strip())
+            self._partial = ""
+            self._lines = []
+            self._size = 0
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        if lines:
+            write_server_log_batch(lines, self.level)
+
+    def isatty(self):
+        return False
@@ -5,5 +5,6 @@ Middleware components for capturing HTTP traffic.
 """
 
 from .request_logger import TUIMiddleware
+from .fused import TUIFusedMiddleware, CORSConfig
 
-__all__ = ["TUIMiddleware"]
+__all__ = ["TUIMiddleware", "TUIFusedMiddleware", "CORSConfig"]
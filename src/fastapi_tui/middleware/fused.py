@@ -0,0 +1,159 @@
+"""
+TUI Middleware - Fused (TUI + CORS + Exceptions)
+
+Eine einzige Middleware statt CORSMiddleware + TUIMiddleware + Exception-Handler.
+Spart pro Request die zusätzlichen Middleware-Frames.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from multiprocessing import Queue as MPQueue
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+from .request_logger import TUIMiddleware
+
+ALL_METHODS = ("DELETE", "GET", "HEAD", "OPTIONS", "PATCH", "POST", "PUT")
+# Header, die Starlettes CORSMiddleware immer erlaubt
+SAFELISTED_HEADERS = ("Accept", "Accept-Language", "Content-Language", "Content-Type")
+
+
+@dataclass
+class CORSConfig:
+    """
+    CORS-Einstellungen für TUIFusedMiddleware (Semantik wie Starlettes CORSMiddleware).
+    """
+    allow_origins: List[str] = field(default_factory=lambda: ["*"])
+    allow_methods: List[str] = field(default_factory=lambda: ["GET"])
+    allow_headers: List[str] = field(default_factory=list)
+    allow_credentials: bool = False
+    expose_headers: List[str] = field(default_factory=list)
+    max_age: int = 600
+
+    def __post_init__(self):
+        self.allow_all_origins = "*" in self.allow_origins
+        self.allow_all_headers = "*" in self.allow_headers
+        self._origins = frozenset(self.allow_origins)
+        methods = ALL_METHODS if "*" in self.allow_methods else self.allow_methods
+        self._methods = frozenset(methods)
+        allowed_headers = sorted(set(SAFELISTED_HEADERS) | set(self.allow_headers))
+        self._allowed_headers = frozenset(h.lower() for h in allowed_headers)
+
+        # Statische Header einmalig vorbauen
+        self.simple_headers: Dict[str, str] = {}
+        if self.allow_credentials:
+            self.simple_headers["Access-Control-Allow-Credentials"] = "true"
+        if self.expose_headers:
+            self.simple_headers["Access-Control-Expose-Headers"] = ", ".join(self.expose_headers)
+
+        self.preflight_headers: Dict[str, str] = {
+            "Access-Control-Allow-Methods": ", ".join(methods),
+            "Access-Control-Max-Age": str(self.max_age),
+            "Vary": "Origin, Access-Control-Request-Method, Access-Control-Request-Headers",
+        }
+        if self.allow_credentials:
+            self.preflight_headers["Access-Control-Allow-Credentials"] = "true"
+        if not self.allow_all_headers:
+            self.preflight_headers["Access-Control-Allow-Headers"] = ", ".join(allowed_headers)
+
+    def as_middleware_kwargs(self) -> Dict:
+        """Kwargs für Starlettes CORSMiddleware (wenn die TUI nicht aktiv ist)."""
+        return {
+            "allow_origins": self.allow_origins,
+            "allow_methods": self.allow_methods,
+            "allow_headers": self.allow_headers,
+            "allow_credentials": self.allow_credentials,
+            "expose_headers": self.expose_headers,
+            "max_age": self.max_age,
+        }
+
+    def is_origin_allowed(self, origin: str) -> bool:
+        return self.allow_all_origins or origin in self._origins
+
+    def is_preflight(self, request: Request) -> bool:
+        return (
+            request.method == "OPTIONS"
+            and "origin" in request.headers
+            and "access-control-request-method" in request.headers
+        )
+
+    def preflight_response(self, request: Request) -> Response:
+        origin = request.headers["origin"]
+        headers = dict(self.preflight_headers)
+        # Wie Starlette: alle Verstöße sammeln und gemeinsam melden
+        failures = []
+
+        if self.is_origin_allowed(origin):
+            self._set_origin(headers, origin)
+        else:
+            failures.append("origin")
+
+        if request.headers["access-control-request-method"] not in self._methods:
+            failures.append("method")
+
+        requested_headers = request.headers.get("access-control-request-headers")
+        if requested_headers:
+            if self.allow_all_headers:
+                headers["Access-Control-Allow-Headers"] = requested_headers
+            elif any(
+                h.strip().lower() not in self._allowed_headers
+                for h in requested_headers.split(",")
+            ):
+                failures.append("headers")
+
+        if failures:
+            return Response("Disallowed CORS " + ", ".join(failures), status_code=400, headers=headers)
+        return Response("OK", status_code=200, headers=headers)
+
+    def apply(self, request: Request, response: Response) -> None:
+        """Setzt die CORS-Header auf eine normale (Nicht-Preflight) Response."""
+        origin = request.headers.get("origin")
+        if origin is None:
+            return
+        # Antwort hängt immer vom Origin ab → Caches müssen danach unterscheiden
+        vary = response.headers.get("Vary")
+        response.headers["Vary"] = f"{vary}, Origin" if vary else "Origin"
+        if not self.is_origin_allowed(origin):
+            return
+        response.headers.update(self.simple_headers)
+        # Requests mit Cookies dürfen kein "*" bekommen → Origin spiegeln
+        self._set_origin(response.headers, origin, has_cookie="cookie" in request.headers)
+
+    def _set_origin(self, headers, origin: str, has_cookie: bool = False) -> None:
+        if self.allow_all_origins and not self.allow_credentials and not has_cookie:
+            headers["Access-Control-Allow-Origin"] = "*"
+        else:
+            # Mit Credentials/Cookies darf "*" nicht verwendet werden → Origin spiegeln
+            headers["Access-Control-Allow-Origin"] = origin
+
+
+class TUIFusedMiddleware(TUIMiddleware):
+    """
+    TUIMiddleware + CORS + Exception-Capture in einem einzigen Middleware-Frame.
+    
+    - CORS Preflights werden direkt beantwortet (ohne call_next)
+    - Exceptions werden an die TUI gemeldet und als JSON-Error beantwortet
+    """
+
+    def __init__(self, app, queue: Optional[MPQueue] = None, cors: Optional[CORSConfig] = None):
+        super().__init__(app, queue=queue)
+        self.cors = cors
+
+    async def dispatch(self, request: Request, call_next):
+        cors = self.cors
+        if cors is not None and cors.is_preflight(request):
+            return cors.preflight_response(request)
+
+        try:
+            response = await super().dispatch(request, call_next)
+        except Exception as exc:
+            # Nur der Passthrough-Pfad von TUIMiddleware (keine Queue oder
+            # ausgeschlossener Pfad) lässt Exceptions durch; sonst fängt
+            # TUIMiddleware.dispatch sie schon selbst ab
+            from ..exception_handler_utils import handle_exception_with_tui
+            response = handle_exception_with_tui(request, exc)
+
+        if cors is not None:
+            cors.apply(request, response)
+        return response
@@ -2,9 +2,8 @@
 TUI Middleware - Request Logger
 """
 
-import json
-import uuid
 import re
+import time
 from datetime import datetime
 from typing import Any, Dict, Optional
 from multiprocessing import Queue as MPQueue
@@ -16,21 +15,39 @@ from starlette.routing import Match
 
 # NEU: Config importieren
 from ..config import get_config
+from ..core.events import create_hit_id, get_route_index
+from ..json_utils import json_loads
 
 class TUIMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app, queue: MPQueue):
+    def __init__(self, app, queue: Optional[MPQueue] = None):
         super().__init__(app)
-        self.queue = queue
+        self._queue = queue
         # NEU: Config laden
         self.config = get_config()
+        # Hot-Path Methoden einmalig binden (Config ist nach dem Start eingefroren)
+        self._should_log_request = self.config.should_log_request
+        self._scrub_data = self.config.scrub_data
+        # Starlette liefert Header-Keys immer lowercase → Set-Schnitt reicht
+        self._scrub_headers = self.config.scrub_headers_lower
+    
+    @property
+    def queue(self) -> Optional[MPQueue]:
+        # Ohne explizite Queue verbinden wir beim ersten Zugriff (normalerweise
+        # schon im Lifespan passiert, dann ist das nur ein Lookup)
+        if self._queue is None:
+            from ..configure_tui import connect_tui
+            self._queue = connect_tui()
+        return self._queue
     
     async def dispatch(self, request: Request, call_next):
         # NEU: Prüfen ob Request geloggt werden soll
-        if not self.config.should_log_request(request.url.path, request.method):
+        if self.queue is None or not self._should_log_request(request.url.path, request.method):
             return await call_next(request)
 
-        request_id = str(uuid.uuid4())
+        request_id = create_hit_id()
         start_time = datetime.now()
+        # Dauer über die monotone Uhr (billiger als datetime-Arithmetik, immun gegen Uhr-Sprünge)
+        start_counter = time.perf_counter()
         
         from ..loggers.runtime_logger import runtime_logs_ctx, request_id_ctx, log_queue_ctx, get_runtime_logs
         
@@ -40,6 +57,7 @@ class TUIMiddleware(BaseHTTPMiddleware):
         
         request.state.tui_request_id = request_id
         request.state.tui_start_time = start_time
+        request.state.tui_start_counter = start_counter
         request.state.tui_log_queue = self.queue
         
         try:
@@ -47,12 +65,14 @@ class TUIMiddleware(BaseHTTPMiddleware):
             
             # NEU: Body maskieren
             raw_body = await self._capture_request_body(request)
-            request_body = self.config.scrub_data(raw_body) if raw_body else None
+            request_body = self._scrub_data(raw_body) if raw_body else None
             
             # NEU: Headers maskieren
-            request_headers = self.config.scrub_headers(self._capture_headers(request))
+            request_headers = self._scrub_headers(self._capture_headers(request))
             
             endpoint_path = self._get_endpoint_path(request)
+            # Für die Exception-Handler: Abschluss unter derselben Route melden
+            request.state.tui_endpoint = endpoint_path
             
             self._send_pending_event(
                 request_id=request_id,
@@ -77,19 +97,21 @@ class TUIMiddleware(BaseHTTPMiddleware):
                     log_to_runtime=True
                 )
 
-            duration = (datetime.now() - start_time).total_seconds() * 1000
+            duration = (time.perf_counter() - start_counter) * 1000
             
             # NEU: Response Body maskieren (falls aktiviert)
             response_body = None
             if self.config.enable_response_body:
                 raw_res_body, response = await self._capture_response_body(response)
-                response_body = self.config.scrub_data(raw_res_body) if raw_res_body else None
+                response_body = self._scrub_data(raw_res_body) if raw_res_body else None
             else:
                 response_body = "<disabled>"
             
             self._send_completed_event(
                 request_id=request_id,
-                endpoint=request.url.path,
+                # Gleicher Endpoint wie im Pending-Event, sonst findet die TUI den
+                # Hit nicht (bzw. legt ihn unter dem Pfad statt der Route an)
+                endpoint=endpoint_path,
                 method=request.method,
                 status_code=response.status_code,
                 duration_ms=duration,
@@ -125,7 +147,7 @@ class TUIMiddleware(BaseHTTPMiddleware):
             content_type = request.headers.get("content-type", "")
             
             if "application/json" in content_type:
-                result = json.loads(body_bytes.decode())
+                result = json_loads(body_bytes)
             elif "application/x-www-form-urlencoded" in content_type:
                 result = self._parse_urlencoded(body_bytes)
             elif "multipart/form-data" in content_type:
@@ -196,7 +218,8 @@ class TUIMiddleware(BaseHTTPMiddleware):
     def _get_endpoint_path(self, request: Request) -> str:
         """Get the endpoint path, trying to match route templates"""
         try:
-            for route in request.app.routes:
+            # Nur Routen mit passendem erstem Segment prüfen (siehe RouteIndex)
+            for route in get_route_index(request.app).candidates(request.url.path):
                 match, _ = route.matches(request.scope)
                 if match == Match.FULL:
                     return route.path
@@ -229,7 +252,7 @@ class TUIMiddleware(BaseHTTPMiddleware):
         # 3. JSON Parsen
         try:
             if body_bytes:
-                response_body = json.loads(body_bytes.decode())
+                response_body = json_loads(body_bytes)
         except Exception:
             pass
         
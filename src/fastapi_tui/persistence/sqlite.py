@@ -7,10 +7,18 @@ Speichert TUI-Events in einer SQLite-Datenbank für Session-Persistenz.
 import sqlite3
 import json
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import Iterator, List, Dict, Any, Optional
 import os
 import uuid
 from ..config import get_config  # Import der Config-Logik
+from ..core.events import create_hit_id
+
+
+_INSERT_HIT_SQL = '''INSERT OR REPLACE INTO endpoint_hits
+                     (id, session_id, endpoint, method, status_code, duration_ms, timestamp, data)
+                     VALUES (?, ?, ?, ?, ?, ?, ?, ?)'''
+_INSERT_LOG_SQL = "INSERT INTO server_logs (session_id, level, message, timestamp) VALUES (?, ?, ?, ?)"
+
 
 class TUIPersistence:
     def __init__(self):
@@ -37,6 +45,12 @@ class TUIPersistence:
         else:
             self.current_session_id = "disabled"
     
+    def _connect(self) -> sqlite3.Connection:
+        """Verbindung für Writes: WAL (siehe _init_db) + synchronous=NORMAL statt fsync pro Commit"""
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
     def _init_db(self):
         """Initialisiert die Datenbank-Tabellen"""
         if not self.enabled:
@@ -45,6 +59,9 @@ class TUIPersistence:
         try:
             conn = sqlite3.connect(self.db_path)
             c = conn.cursor()
+            # WAL ist persistent in der DB-Datei: Leser blockieren Writes nicht,
+            # Commits brauchen mit synchronous=NORMAL keinen fsync mehr
+            c.execute("PRAGMA journal_mode=WAL")
             
             # Sessions Table
             c.execute('''CREATE TABLE IF NOT EXISTS sessions
@@ -134,12 +151,12 @@ class TUIPersistence:
             return
 
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             c = conn.cursor()
             
             # Ensure ID
             if "id" not in hit_data:
-                hit_data["id"] = str(uuid.uuid4())
+                hit_data["id"] = create_hit_id()
                 
             c.execute('''INSERT OR REPLACE INTO endpoint_hits 
                          (id, session_id, endpoint, method, status_code, duration_ms, timestamp, data)
@@ -154,12 +171,52 @@ class TUIPersistence:
             # print(f"[PERSISTENCE] Error saving hit: {e}")
             pass
 
+    def save_batch(self, hits: List[Dict[str, Any]], logs: List[tuple]):
+        """
+        Speichert Hits und (level, message, timestamp) Logs zusammen in EINER
+        Transaktion (ein Commit für den ganzen Batch).
+        """
+        if not self.enabled or (not hits and not logs):
+            return
+
+        try:
+            session_id = self.current_session_id
+            hit_rows = []
+            for hit_data in hits:
+                if "id" not in hit_data:
+                    hit_data["id"] = create_hit_id()
+                hit_rows.append((hit_data["id"], session_id, hit_data.get("endpoint"), hit_data.get("method"),
+                                 hit_data.get("status_code"), hit_data.get("duration_ms"),
+                                 hit_data.get("timestamp"), json.dumps(hit_data, default=str)))
+
+            conn = self._connect()
+            try:
+                with conn:  # commit am Ende, Rollback bei Fehler
+                    # Reihenfolge bleibt erhalten: spätere Updates desselben Hits gewinnen
+                    if hit_rows:
+                        conn.executemany(_INSERT_HIT_SQL, hit_rows)
+                    if logs:
+                        conn.executemany(_INSERT_LOG_SQL,
+                                         [(session_id, level, message, timestamp) for level, message, timestamp in logs])
+            finally:
+                conn.close()
+        except Exception:
+            pass
+
+    def save_hits_bulk(self, hits: List[Dict[str, Any]]):
+        """Speichert mehrere Hits in EINER Transaktion (ein Commit statt einem pro Hit)."""
+        self.save_batch(hits, [])
+
+    def save_logs_bulk(self, logs: List[tuple]):
+        """Speichert mehrere (level, message, timestamp) Logs in EINER Transaktion."""
+        self.save_batch([], logs)
+
     def save_log(self, level: str, message: str, timestamp: datetime):
         if not self.enabled:
             return
 
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             c = conn.cursor()
             c.execute("INSERT INTO server_logs (session_id, level, message, timestamp) VALUES (?, ?, ?, ?)",
                       (self.current_session_id, level, message, timestamp))
@@ -191,6 +248,41 @@ class TUIPersistence:
         except Exception:
             return []
     
+    def iter_recent_hits(self, limit: int = 100, session_id: Optional[str] = None,
+                         chunk_size: int = 500, raw: bool = False) -> Iterator[List[Any]]:
+        """
+        Wie get_recent_hits (die letzten `limit` Hits), aber älteste zuerst und
+        in Chunks à `chunk_size` per fetchmany – kein reversed() und keine
+        komplett materialisierte Ergebnisliste.
+        
+        raw=True liefert die gespeicherten JSON-Strings ungeparst (z.B. für
+        EndpointHit.model_validate_json, spart das json.loads).
+        """
+        if not self.enabled:
+            return
+
+        target_session = session_id or self.current_session_id
+        try:
+            conn = sqlite3.connect(self.db_path)
+        except Exception:
+            return
+        try:
+            c = conn.cursor()
+            c.execute('''SELECT data FROM
+                           (SELECT data, timestamp FROM endpoint_hits
+                            WHERE session_id = ?
+                            ORDER BY timestamp DESC LIMIT ?)
+                         ORDER BY timestamp ASC''', (target_session, limit))
+            while True:
+                rows = c.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield [row[0] for row in rows] if raw else [json.loads(row[0]) for row in rows]
+        except Exception:
+            return
+        finally:
+            conn.close()
+
     def get_recent_logs(self, limit: int = 1000, session_id: Optional[str] = None) -> List[Dict[str, Any]]:
         if not self.enabled:
             return []
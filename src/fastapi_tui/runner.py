@@ -34,6 +34,7 @@ class TUIRunner:
         
         self.queue = None
         self.manager = None
+        self.config_shm = None
         self.api_process = None
         self.stop_event = threading.Event()
     
@@ -121,9 +122,31 @@ class TUIRunner:
     def _get_subprocess_env(self) -> dict:
         env = os.environ.copy()
         env["PYTHONUNBUFFERED"] = "1"
-        env["TUI_CONFIG_PAYLOAD"] = self.config.to_json_payload()
+        shm_spec = self._share_config_payload()
+        if shm_spec:
+            env["TUI_CONFIG_SHM"] = shm_spec
+        else:
+            env["TUI_CONFIG_PAYLOAD"] = self.config.to_json_payload()
         return env
 
+    def _share_config_payload(self) -> Optional[str]:
+        """
+        Legt den Config-Payload einmalig in SharedMemory ab.
+        Alle (Reload-)Kindprozesse lesen denselben Block.
+        Gibt "<name>:<length>" zurück oder None (→ Fallback auf Env-Var).
+        """
+        if self.config_shm is None:
+            try:
+                from multiprocessing import shared_memory
+                payload = self.config.to_json_payload().encode("utf-8")
+                shm = shared_memory.SharedMemory(create=True, size=max(len(payload), 1))
+                shm.buf[:len(payload)] = payload
+                self.config_shm = (shm, len(payload))
+            except Exception:
+                return None
+        shm, length = self.config_shm
+        return f"{shm.name}:{length}"
+
     def _start_api_process(self) -> None:
         env = self._get_subprocess_env()
         cmd = [
@@ -131,6 +154,8 @@ class TUIRunner:
             self.app_module,
             "--host", self.host,
             "--port", str(self.port),
+            # TUIMiddleware erfasst jeden Request schon selbst
+            "--no-access-log",
         ]
         self.api_process = subprocess.Popen(
             cmd, env=env, cwd=os.getcwd(),
@@ -145,6 +170,7 @@ class TUIRunner:
             "--host", self.host,
             "--port", str(self.port),
             "--reload",
+            "--no-access-log",
         ]
         for reload_dir in self.config.reload_dirs:
             cmd.extend(["--reload-dir", reload_dir])
@@ -181,8 +207,8 @@ class TUIRunner:
                 path = route.path
                 
                 # 1. Filter: Exclude Paths
-                # Prüft, ob der Pfad exakt in der Ausschlussliste ist
-                if path in self.config.exclude_paths:
+                # Prüft, ob der Pfad ausgeschlossen ist (exakt oder Wildcard-Prefix)
+                if self.config.is_path_excluded(path):
                     continue
                 
                 # 2. Filter: Exclude Methods
@@ -220,6 +246,14 @@ class TUIRunner:
                 self.api_process.kill()
         if self.manager:
             self.manager.shutdown()
+        if self.config_shm:
+            shm, _ = self.config_shm
+            self.config_shm = None
+            try:
+                shm.close()
+                shm.unlink()
+            except Exception:
+                pass
 
 def run_tui(
     app: Optional[Any] = None,
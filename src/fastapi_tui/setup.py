@@ -1,6 +1,5 @@
-import sys
 from typing import Optional, Callable, TYPE_CHECKING
-from .config import TUIConfig, set_config
+from .config import TUIConfig, set_config, _parse_cli_args
 
 if TYPE_CHECKING:
     from fastapi import FastAPI
@@ -29,7 +28,7 @@ def with_tui(
     set_config(config)
     
     # --- FALL 1: TUI Modus ---
-    if "--tui" in sys.argv:
+    if _parse_cli_args().tui:
         from .runner import run_tui
         
         run_tui(
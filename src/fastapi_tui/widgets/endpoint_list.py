@@ -7,7 +7,7 @@ from textual.widgets import Static, ListView, ListItem, Label
 from textual.containers import Container, Vertical
 from textual.reactive import reactive
 from textual.message import Message
-from typing import Dict, List
+from typing import Dict, List, Tuple
 from rich.text import Text
 
 
@@ -53,6 +53,7 @@ class EndpointList(Vertical):
         self.border_title = "📡 Endpoints"
         self._mounted = False
         self._config = None
+        self._refresh_scheduled = False
     
     def compose(self) -> ComposeResult:
         yield ListView(id="endpoint-listview")
@@ -82,11 +83,19 @@ class EndpointList(Vertical):
         Wird automatisch aufgerufen wenn self.endpoints sich ändert.
         Triggert automatisches UI-Update!
         """
-        if self._mounted:
-            self._refresh_list()
-            if new_endpoints:
-                total_hits = sum(e["hit_count"] for e in new_endpoints.values())
-                self.log(f"Endpoints updated: {len(new_endpoints)} endpoints, {total_hits} total hits")
+        # Neuaufbau gesammelt: bei einem Burst ändert jeder Hit den Count, die
+        # Liste wird aber nur einmal nach dem aktuellen Durchlauf neu gebaut
+        if self._mounted and not self._refresh_scheduled:
+            self._refresh_scheduled = True
+            self.call_later(self._apply_endpoints)
+    
+    def _apply_endpoints(self) -> None:
+        """Baut die Liste für den aktuellen Stand von self.endpoints neu auf."""
+        self._refresh_scheduled = False
+        self._refresh_list()
+        if self.endpoints:
+            total_hits = sum(e["hit_count"] for e in self.endpoints.values())
+            self.log(f"Endpoints updated: {len(self.endpoints)} endpoints, {total_hits} total hits")
     
     # ============================================================================
     # PUBLIC API
@@ -108,7 +117,23 @@ class EndpointList(Vertical):
         
         current_endpoints[endpoint]["hit_count"] += 1
         self.endpoints = current_endpoints  # ← Triggert watch_endpoints()
-    
+
+    def add_endpoints_bulk(self, pairs: List[Tuple[str, str]]) -> None:
+        """
+        Wie add_endpoint für mehrere (endpoint, method) Paare, aber mit EINER
+        Zuweisung → watch_endpoints() baut die Liste nur einmal neu auf
+        (z.B. beim startup_routes Burst mit hunderten Routen).
+        """
+        if not pairs:
+            return
+        current_endpoints = dict(self.endpoints)
+        for endpoint, method in pairs:
+            data = current_endpoints.get(endpoint)
+            if data is None:
+                data = current_endpoints[endpoint] = {"method": method, "hit_count": 0}
+            data["hit_count"] += 1
+        self.endpoints = current_endpoints  # ← Triggert watch_endpoints() einmal
+
     def clear(self) -> None:
         """Leert die Liste komplett."""
         # Das Setzen auf ein leeres Dict triggert watch_endpoints,
@@ -141,17 +166,19 @@ class EndpointList(Vertical):
                 reverse=True
             )
             
+            items = []
             for endpoint, data in sorted_endpoints:
                 # Formatiere den Endpoint für die Anzeige
                 display_endpoint = self._format_endpoint(endpoint)
-                
-                item = EndpointListItem(
+
+                items.append(EndpointListItem(
                     endpoint=endpoint,  # Original für interne Logik
                     display_endpoint=display_endpoint,  # Formatiert für Anzeige
                     method=data["method"],
                     hit_count=data["hit_count"]
-                )
-                listview.append(item)
+                ))
+            # Ein Mount für alle Items statt einem pro Endpoint
+            listview.extend(items)
         except Exception as e:
             self.log(f"Error refreshing endpoint list: {e}")
     
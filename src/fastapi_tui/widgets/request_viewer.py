@@ -3,7 +3,7 @@ from textual.app import ComposeResult
 from textual.widgets import Static, DataTable, TabbedContent, TabPane
 from textual.containers import Vertical, ScrollableContainer
 from textual.reactive import reactive
-from typing import List
+from typing import Dict, List, Optional
 from rich.text import Text
 
 from ..core.models import EndpointHit, CustomEvent
@@ -15,11 +15,16 @@ class RequestViewer(Vertical):
     hits: reactive[List[EndpointHit]] = reactive([], always_update=True)
     events: reactive[List[CustomEvent]] = reactive([], always_update=True)
     
-    def __init__(self, endpoint: str, **kwargs):
+    def __init__(self, endpoint: str, max_hits: int = 100, **kwargs):
         super().__init__(**kwargs)
         self.endpoint = endpoint
+        # Ringpuffer-Größe: ältere Hits fallen raus (begrenzt den Speicher pro Endpoint)
+        self.max_hits = max(1, max_hits)
         self._mounted = False
         self._current_viewing_hit_id = None
+        # ID → Hit-Objekt in self.hits (O(1)-Lookup statt Liste durchsuchen)
+        self._hits_by_id: Dict[str, EndpointHit] = {}
+        self._refresh_scheduled = False
     
     def compose(self) -> ComposeResult:
         with TabbedContent():
@@ -37,7 +42,8 @@ class RequestViewer(Vertical):
         self.styles.border = ("solid", "green")
         
         # TABELLE SETUP
-        table = self.query_one("#requests-table", DataTable)
+        # Tabellen einmal auflösen: _refresh_table_smart läuft pro Hit
+        self._requests_table = table = self.query_one("#requests-table", DataTable)
         table.cursor_type = "row"
         
         # WICHTIG: Explizite Keys setzen! Sonst funktioniert update_cell oft nicht richtig.
@@ -47,7 +53,7 @@ class RequestViewer(Vertical):
         table.add_column("Duration", key="col_duration")
         table.add_column("ID", key="col_id")
         
-        events_table = self.query_one("#events-table", DataTable)
+        self._events_table = events_table = self.query_one("#events-table", DataTable)
         events_table.add_columns("Time", "Type", "Level", "Message")
         
         self._mounted = True
@@ -56,38 +62,91 @@ class RequestViewer(Vertical):
         if self.hits:
             self._refresh_table_smart(self.hits)
 
-    def add_hit(self, hit: EndpointHit) -> None:
+    def add_hit(self, hit: EndpointHit) -> List[str]:
+        """Fügt einen Hit ein bzw. ersetzt ihn. Gibt die IDs der verdrängten Hits zurück."""
         # 1. Echte Kopie erstellen (WICHTIG!)
         hit_safe = hit.model_copy()
         
-        # 2. Index suchen
-        existing_index = -1
-        for i, h in enumerate(self.hits):
-            if h.id == hit_safe.id:
-                existing_index = i
-                break
-        
-        # 3. Liste kopieren für Reaktivität
+        # 2. Liste kopieren für Reaktivität
         new_list = self.hits[:]
+        hits_by_id = self._hits_by_id
         
-        if existing_index >= 0:
+        # 3. Position nur bei Updates suchen (neue Hits: ein Dict-Miss, kein Scan)
+        evicted: List[str] = []
+        existing = hits_by_id.get(hit_safe.id)
+        if existing is not None:
+            existing_index = next(i for i, h in enumerate(new_list) if h is existing)
             new_list[existing_index] = hit_safe
         else:
             # Neue Hits vorne einfügen (neueste zuerst)
             new_list.insert(0, hit_safe)
-            new_list = new_list[:100]
+            if len(new_list) > self.max_hits:
+                evicted = [h.id for h in new_list[self.max_hits:]]
+                del new_list[self.max_hits:]
+        hits_by_id[hit_safe.id] = hit_safe
+        for hit_id in evicted:
+            del hits_by_id[hit_id]
 
         # 4. Zuweisen (triggert watch_hits)
         self.hits = new_list
+        return evicted
+
+    def extend_hits(self, hits: List[EndpointHit]) -> List[str]:
+        """
+        Wie add_hit für mehrere Hits (älteste zuerst), aber mit EINER Zuweisung
+        → Tabelle wird nur einmal neu aufgebaut. Gibt verdrängte IDs zurück.
+        """
+        new_list = self.hits[:]
+        hits_by_id = self._hits_by_id
+        index = None  # Positionen erst bauen, wenn ein Hit schon existiert
+        fresh: Dict[str, EndpointHit] = {}  # neue Hits in Ankunftsreihenfolge
+        for hit in hits:
+            hit_safe = hit.model_copy()
+            if hit_safe.id in fresh:
+                fresh[hit_safe.id] = hit_safe
+            elif hit_safe.id in hits_by_id:
+                if index is None:
+                    index = {h.id: i for i, h in enumerate(new_list)}
+                new_list[index[hit_safe.id]] = hit_safe
+            else:
+                fresh[hit_safe.id] = hit_safe
+            hits_by_id[hit_safe.id] = hit_safe
+        
+        evicted: List[str] = []
+        if fresh:
+            # Neueste zuerst, wie bei add_hit
+            new_list = list(reversed(fresh.values())) + new_list
+            if len(new_list) > self.max_hits:
+                evicted = [h.id for h in new_list[self.max_hits:]]
+                del new_list[self.max_hits:]
+                for hit_id in evicted:
+                    del hits_by_id[hit_id]
+        
+        self.hits = new_list
+        return evicted
+
+    def get_hit(self, hit_id: str) -> Optional[EndpointHit]:
+        """Hit mit dieser ID (das Objekt in self.hits) oder None."""
+        return self._hits_by_id.get(hit_id)
 
     def add_event(self, event: CustomEvent) -> None:
-        self.events = [event] + self.events[:99]
+        self.events = [event] + self.events[:self.max_hits - 1]
 
     def watch_hits(self, old_hits: List[EndpointHit], new_hits: List[EndpointHit]) -> None:
         if not self._mounted: return
         
+        # Nicht pro add_hit neu zeichnen: ein Durchlauf von process_events
+        # ändert die Liste evtl. dutzende Male → einmal danach rendern
+        if not self._refresh_scheduled:
+            self._refresh_scheduled = True
+            self.call_later(self._apply_hits)
+
+    def _apply_hits(self) -> None:
+        """Rendert den aktuellen Stand von self.hits (siehe watch_hits)."""
+        self._refresh_scheduled = False
+        
         # 1. Tabelle aktualisieren
-        self._refresh_table_smart(new_hits)
+        self._refresh_table_smart(self.hits)
         
         # 2. Detailansicht aktualisieren
         self._update_inspector_live()
@@ -97,7 +156,7 @@ class RequestViewer(Vertical):
 
     def _refresh_table_smart(self, current_hits: List[EndpointHit]):
         """Refresh table with correct order - newest first."""
-        table = self.query_one("#requests-table", DataTable)
+        table = self._requests_table
         
         # Track which rows exist and need updates vs new rows
         existing_keys = set(table.rows.keys())
@@ -113,7 +172,9 @@ class RequestViewer(Vertical):
             selected_key = None
             if table.cursor_row is not None and table.row_count > 0:
                 try:
-                    selected_key = table.get_row_at(table.cursor_row)
+                    # Row-Key (str), nicht get_row_at (liefert die Zellwerte als Liste
+                    # → unhashable beim Vergleich mit current_keys)
+                    selected_key = table.coordinate_to_cell_key(table.cursor_coordinate).row_key.value
                 except:
                     pass
             
@@ -177,7 +238,7 @@ class RequestViewer(Vertical):
             return
 
         # Den aktuellen Hit aus der Liste holen
-        current_hit = next((h for h in self.hits if h.id == self._current_viewing_hit_id), None)
+        current_hit = self._hits_by_id.get(self._current_viewing_hit_id)
         
         if current_hit:
             try:
@@ -189,7 +250,7 @@ class RequestViewer(Vertical):
     def on_data_table_row_selected(self, event: DataTable.RowSelected) -> None:
         if event.data_table.id == "requests-table":
             hit_id = event.row_key.value
-            hit = next((h for h in self.hits if h.id == hit_id), None)
+            hit = self._hits_by_id.get(hit_id)
             if hit:
                 self._show_hit_details(hit)
 
@@ -207,7 +268,7 @@ class RequestViewer(Vertical):
     # Events Tabelle Logik
     def watch_events(self, old_e, new_e):
         if not self._mounted: return
-        table = self.query_one("#events-table", DataTable)
+        table = self._events_table
         table.clear()
         for e in new_e:
             table.add_row(
@@ -221,13 +282,21 @@ class RequestViewer(Vertical):
     def clear(self) -> None:
         """Leert den Viewer komplett."""
         self.hits = []
+        self._hits_by_id = {}
         self.events = []
         self._current_viewing_hit_id = None
         
         if self._mounted:
-            self.query_one("#requests-table", DataTable).clear()
-            self.query_one("#events-table", DataTable).clear()
+            self._requests_table.clear()
+            self._events_table.clear()
             
+            # Details nur zurücksetzen, wenn gerade ein Request angezeigt wird
             container = self.query_one("#details-scroll", ScrollableContainer)
-            container.remove_children()
-            container.mount(Static("Select a request to view details", id="details-placeholder"))
\ No newline at end of file
+            if not container.query("#details-placeholder"):
+                self.call_later(self._reset_details)
+
+    async def _reset_details(self) -> None:
+        # Erst nach dem Entfernen neu mounten, sonst kollidiert die Placeholder-ID
+        container = self.query_one("#details-scroll", ScrollableContainer)
+        await container.remove_children()
+        await container.mount(Static("Select a request to view details", id="details-placeholder"))
\ No newline at end of file
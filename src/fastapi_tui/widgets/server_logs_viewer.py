@@ -26,6 +26,8 @@ class ServerLogsViewer(Container):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.all_logs: List[Dict[str, Any]] = []
+        # Log-Widgets nach ID, einmal in on_mount aufgelöst (add_log läuft pro Zeile)
+        self._log_widgets: Dict[str, AutoScrollLog] = {}
     
     def compose(self) -> ComposeResult:
         """Create the tabbed structure"""
@@ -45,6 +47,9 @@ class ServerLogsViewer(Container):
             with TabPane("Application", id="logs-application"):
                 yield AutoScrollLog(id="log-application", highlight=True)
     
+    def on_mount(self) -> None:
+        self._log_widgets = {log.id: log for log in self.query(AutoScrollLog)}
+    
     def add_log(self, log_data: Dict[str, Any]) -> None:
         """
         Add a log entry and route it to appropriate tabs.
@@ -84,7 +89,7 @@ class ServerLogsViewer(Container):
         
         # 1. Always add to "All Logs"
         try:
-            log_all = self.query_one("#log-all", AutoScrollLog)
+            log_all = self._log_widgets["log-all"]
             log_all.write_line(formatted_line)
         except:
             pass  # Widget not mounted yet
@@ -119,7 +124,7 @@ class ServerLogsViewer(Container):
         
         if level == "INFO" and any(indicator in message for indicator in http_indicators):
             try:
-                log_http = self.query_one("#log-http", AutoScrollLog)
+                log_http = self._log_widgets["log-http"]
                 log_http.write_line(line)
             except:
                 pass
@@ -128,7 +133,7 @@ class ServerLogsViewer(Container):
         """Route exception logs"""
         if level in ["ERROR", "CRITICAL"]:
             try:
-                log_exc = self.query_one("#log-exceptions", AutoScrollLog)
+                log_exc = self._log_widgets["log-exceptions"]
                 log_exc.write_line(line)
             except:
                 pass
@@ -142,7 +147,7 @@ class ServerLogsViewer(Container):
         
         if log_type == "SYSTEM" or any(keyword in message for keyword in system_keywords):
             try:
-                log_sys = self.query_one("#log-system", AutoScrollLog)
+                log_sys = self._log_widgets["log-system"]
                 log_sys.write_line(line)
             except:
                 pass
@@ -155,7 +160,7 @@ class ServerLogsViewer(Container):
             http_indicators = ['HTTP/1.1', '" 200', '" 400', '" 500']
             if not any(indicator in line for indicator in http_indicators):
                 try:
-                    log_app = self.query_one("#log-application", AutoScrollLog)
+                    log_app = self._log_widgets["log-application"]
                     log_app.write_line(line)
                 except:
                     pass
@@ -165,7 +170,7 @@ class ServerLogsViewer(Container):
         self.all_logs.clear()
         for log_id in ["log-all", "log-http", "log-exceptions", "log-system", "log-application"]:
             try:
-                log_widget = self.query_one(f"#{log_id}", AutoScrollLog)
+                log_widget = self._log_widgets[log_id]
                 log_widget.clear()
             except:
                 pass
@@ -97,6 +97,14 @@ class StatsDashboard(Vertical):
         current_stats = dict(self.stats)
         current_stats[endpoint] = stats
         self.stats = current_stats
+    
+    def update_stats_bulk(self, stats: Dict[str, EndpointStats]) -> None:
+        """Aktualisiert mehrere Endpoints mit nur einem Neuaufbau der Anzeige."""
+        if not stats:
+            return
+        current_stats = dict(self.stats)
+        current_stats.update(stats)
+        self.stats = current_stats
         
     def update_system_stats(self, stats: SystemStats) -> None:
         """Aktualisiert die System-Statistiken."""
@@ -153,7 +161,7 @@ class StatsDashboard(Vertical):
         # RAM
         ram_color = "green" if s.memory_percent < 70 else "yellow" if s.memory_percent < 90 else "red"
         self.query_one("#ram-stat", Static).update(
-            f"[dim]RAM Usage[/]\n[{ram_color}]{s.memory_used_mb:.0f}MB / {s.memory_total_mb:.0f}MB ({s.memory_percent:.0f}%)[/]"
+            f"[dim]RAM Usage[/]\n[{ram_color}]{s.memory_used_mb}MB / {s.memory_total_mb}MB ({s.memory_percent:.0f}%)[/]"
         )
         
         # Uptime